@@ -0,0 +1,69 @@
+import numpy as np
+import struct
+from math import gcd
+from scipy.io import wavfile
+from typing import Dict, List, Optional
+from src import vad
+
+
+def resample(audio: np.ndarray, sample_rate: int, target_rate: int) -> np.ndarray:
+    """Polyphase resampling of a float signal to target_rate."""
+    if sample_rate == target_rate:
+        return audio
+    from scipy.signal import resample_poly  # Slow to import; only needed when rates differ
+    g = gcd(int(sample_rate), int(target_rate))
+    return resample_poly(audio, target_rate // g, sample_rate // g).astype(np.float32)
+
+
+# Sample widths (bytes) scipy can memory-map; 24-bit and other packed containers it can't
+MMAP_WIDTHS = (1, 2, 4, 8)
+
+
+def _sample_width(path: str) -> Optional[int]:
+    """Bytes per sample from a WAV file's fmt chunk (None if it can't be found)."""
+    with open(path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] not in (b"RIFF", b"RF64") or header[8:12] != b"WAVE":
+            return None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if chunk_id == b"fmt ":
+                fmt = f.read(16)
+                channels, block_align = struct.unpack("<H", fmt[2:4])[0], struct.unpack("<H", fmt[12:14])[0]
+                return block_align // channels if channels else None
+            f.seek(size + (size & 1), 1)
+
+
+def read_wav(path: str):
+    """
+    (sample_rate, samples) of a WAV file, memory-mapped when scipy can map it so
+    only the samples used are read; 24-bit files are decoded into memory instead.
+    """
+    return wavfile.read(path, mmap=_sample_width(path) in MMAP_WIDTHS)
+
+
+def analyse_file(path: str) -> Dict:
+    """Run the VAD/quality analysis on a WAV file (any rate, channel count or PCM dtype)."""
+    sr, audio = read_wav(path)
+    analysis = vad.analyse(audio, sr)
+    analysis.update({
+        "sample_rate": sr,
+        "channels": audio.shape[1] if audio.ndim > 1 else 1,
+        "dtype": str(audio.dtype),
+    })
+    return analysis
+
+
+def load_speech(path: str, segments: List[List[int]], target_rate: int) -> np.ndarray:
+    """
+    Decode the given speech segments of a WAV file into mono float32 at target_rate.
+    The file is memory-mapped (where its sample width allows) so only the kept
+    speech is ever copied into RAM.
+    """
+    sr, audio = read_wav(path)
+    segments = segments or [[0, len(audio)]]
+    speech = np.concatenate([vad.to_float(audio[start:end]) for start, end in segments])
+    return resample(speech, sr, target_rate)
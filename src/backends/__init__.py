@@ -0,0 +1,46 @@
+"""
+Synthesis backends, chosen per voice by metadata.json's 'base_model':
+
+    "xtts_v2" (default)          Coqui XTTS v2: cloning, streaming, 17 languages
+    "tts_models/..."             any other Coqui TTS model name
+    "onnx:<path/to/model.onnx>"  VITS exported to ONNX, run with ONNX Runtime (no cloning)
+    "stub"                       deterministic stand-in for tests and benchmarks
+"""
+from typing import Optional, Tuple
+from src.backends.base import Backend, Capabilities
+
+DEFAULT_MODEL = "xtts_v2"
+ALIASES = {
+    "xtts": "tts_models/multilingual/multi-dataset/xtts_v2",
+    "xtts_v2": "tts_models/multilingual/multi-dataset/xtts_v2",
+}
+
+
+def resolve(base_model: Optional[str]) -> Tuple[str, str]:
+    """Map a base_model value to (backend kind, model name)."""
+    name = (base_model or DEFAULT_MODEL).strip()
+    if name == "stub":
+        return "stub", name
+    if name.startswith("onnx:"):
+        return "onnx", name[len("onnx:"):]
+    if name.endswith(".onnx"):
+        return "onnx", name
+    if name.startswith("coqui:"):
+        name = name[len("coqui:"):]
+    return "coqui", ALIASES.get(name, name)
+
+
+def create_backend(base_model: Optional[str] = None, **options) -> Backend:
+    """
+    Build (but don't load) the backend for a base_model value.
+    Options are threads, interop_threads and quantize; backends ignore ones they don't use.
+    """
+    kind, model_name = resolve(base_model)
+    if kind == "stub":
+        from src.backends.stub import StubBackend
+        return StubBackend(model_name, **options)
+    if kind == "onnx":
+        from src.backends.onnx import OnnxVitsBackend
+        return OnnxVitsBackend(model_name, **options)
+    from src.backends.coqui import CoquiBackend
+    return CoquiBackend(model_name, **options)
@@ -0,0 +1,123 @@
+import os
+import pickle
+import numpy as np
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class Capabilities:
+    """What a backend can do, so callers can check before asking for it."""
+
+    def __init__(self, cloning: bool, streaming: bool, languages: Optional[List[str]], sample_rate: int):
+        self.cloning = cloning          # Can condition on reference audio
+        self.streaming = streaming      # Yields audio incrementally
+        self.languages = languages      # None when the backend can't tell
+        self.sample_rate = sample_rate  # Native output rate
+
+    def supports_language(self, language: str) -> bool:
+        return self.languages is None or language in self.languages
+
+    def to_dict(self) -> Dict:
+        return {
+            "cloning": self.cloning,
+            "streaming": self.streaming,
+            "languages": self.languages,
+            "sample_rate": self.sample_rate,
+        }
+
+
+class Backend:
+    """
+    A synthesis engine behind Synthesizer.
+
+    Subclasses implement load(), synthesize() and capabilities; cloning backends
+    also implement compute_latents(), and streaming ones stream(). Audio is mono
+    float32 in [-1, 1] at capabilities.sample_rate. Output caching, file writing
+    and per-voice routing are Synthesizer's job; encoding is src.encode's.
+    """
+
+    # Generation settings that change the output; part of the synthesis cache key
+    config: Dict = {}
+    # Set by the ModelRegistry that owns this backend, so loads it triggers itself are accounted for
+    loader: Optional[Callable[["Backend"], "Backend"]] = None
+
+    def __init__(self, model_name: str, threads: Optional[int] = None, device: Optional[str] = None):
+        self.model_name = model_name
+        self.threads = threads
+        self.device = device        # None: the backend's own choice
+
+    @property
+    def model_id(self) -> str:
+        """Identifies the weights and any variant (e.g. quantisation) in cache keys."""
+        return self.model_name
+
+    @property
+    def loaded(self) -> bool:
+        raise NotImplementedError
+
+    @property
+    def capabilities(self) -> Capabilities:
+        raise NotImplementedError
+
+    def load(self):
+        raise NotImplementedError
+
+    def ensure_loaded(self):
+        """Load on demand, through the owning registry when there is one (see src.models)."""
+        if self.loader is not None:
+            self.loader(self)
+        else:
+            self.load()
+
+    def seed(self, seed: int):
+        """Make the next synthesis reproducible, where the engine allows it."""
+
+    def compute_latents(self, reference_audio_path: str) -> Dict:
+        raise NotImplementedError(f"{self.model_id} does not support voice cloning")
+
+    def synthesize(self, text: str, language: str = "en", latents: Optional[Dict] = None,
+                   reference_audio_path: Optional[str] = None) -> np.ndarray:
+        raise NotImplementedError
+
+    def stream(self, text: str, language: str = "en", latents: Optional[Dict] = None,
+               chunk_size: int = 20) -> Iterator[np.ndarray]:
+        """Yield audio chunks; backends without native streaming yield one chunk."""
+        yield self.synthesize(text, language, latents)
+
+    def speaker_embedding(self, latents: Dict) -> Optional[np.ndarray]:
+        """The voice's identity as a flat vector (for similarity search), or None if the latents have none."""
+        embedding = latents.get("speaker_embedding") if latents else None
+        if embedding is None:
+            return None
+        if hasattr(embedding, "detach"):
+            embedding = embedding.detach().cpu().numpy()
+        return np.asarray(embedding, dtype=np.float32).ravel()
+
+    def postprocess(self, wav: np.ndarray) -> np.ndarray:
+        """Final touch applied to a finished utterance before it is encoded."""
+        return wav
+
+    def save_latents(self, latents: Dict, path: str):
+        # Write-then-rename, so pool workers saving the same voice never leave a torn file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(latents, f)
+        os.replace(tmp_path, path)
+
+    def load_latents(self, path: str) -> Optional[Dict]:
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load cached latents {path}: {e}")
+            return None
+
+    def to_cpu(self):
+        """Move weights to CPU (required before forking workers)."""
+
+    def unload(self):
+        """Drop the loaded weights; load() brings them back."""
+        raise NotImplementedError
+
+    def memory_bytes(self) -> Optional[int]:
+        """Bytes held by the loaded weights, or None if the backend can't tell."""
+        return None
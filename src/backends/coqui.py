@@ -0,0 +1,222 @@
+import os
+import numpy as np
+from typing import Dict, Iterator, Optional
+from src import tracing
+from src.backends.base import Backend, Capabilities
+
+XTTS_MODEL = "tts_models/multilingual/multi-dataset/xtts_v2"
+XTTS_LANGUAGES = ["en", "es", "fr", "de", "it", "pt", "pl", "tr", "ru", "nl", "cs", "ar", "zh-cn", "ja", "hu", "ko", "hi"]
+
+# Generation parameters for better quality
+# temperature: Lower = more stable/conservative (less hallucinations)
+# repetition_penalty: Higher = avoid looping
+# speed: 1.0 is standard
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "repetition_penalty": 1.2,
+    "speed": 0.9,
+    "do_sample": True
+}
+
+
+class CoquiBackend(Backend):
+    """Coqui TTS models through TTS.api; XTTS adds cloning from reference audio and streaming."""
+
+    def __init__(self, model_name: str = XTTS_MODEL, threads: Optional[int] = None,
+                 interop_threads: Optional[int] = None, quantize: bool = False, device: Optional[str] = None):
+        super().__init__(model_name, threads, device)
+        self.interop_threads = interop_threads
+        self.quantize = quantize            # Dynamic int8 on CPU (see src/quantize.py)
+        self.tts = None
+
+    @property
+    def is_xtts(self) -> bool:
+        return "xtts" in self.model_name
+
+    @property
+    def config(self) -> Dict:
+        return GENERATION_CONFIG if self.is_xtts else {}
+
+    @property
+    def model_id(self) -> str:
+        # Quantised output differs, so caches key on the variant too
+        return f"{self.model_name}#int8" if self.quantize else self.model_name
+
+    @property
+    def loaded(self) -> bool:
+        return self.tts is not None
+
+    @property
+    def capabilities(self) -> Capabilities:
+        if self.tts is None:
+            if self.is_xtts:
+                return Capabilities(cloning=True, streaming=True, languages=XTTS_LANGUAGES, sample_rate=24000)
+            self.ensure_loaded()  # Anything else has to be loaded to be described
+        model = self.tts.synthesizer.tts_model
+        languages = self.tts.languages if self.tts.is_multi_lingual else None
+        return Capabilities(
+            cloning=hasattr(model, "get_conditioning_latents"),
+            streaming=hasattr(model, "inference_stream"),
+            languages=list(languages) if languages else None,
+            sample_rate=self.tts.synthesizer.output_sample_rate,
+        )
+
+    def configure_threads(self):
+        """Apply the requested torch thread counts (interop can only be set once per process)."""
+        import torch
+
+        if self.interop_threads:
+            try:
+                torch.set_num_interop_threads(self.interop_threads)
+            except RuntimeError as e:
+                print(f"Warning: Could not set interop threads: {e}")
+        if self.threads:
+            torch.set_num_threads(self.threads)
+
+    def load(self):
+        if self.tts is not None:
+            return
+        import torch
+        from TTS.api import TTS
+
+        print(f"⏳ Loading TTS model: {self.model_id}...")
+        self.configure_threads()
+
+        with tracing.span("model.load", model=self.model_id):
+            # Initialize with gpu=False first to avoid CUDA assertion
+            self.tts = TTS(self.model_name, progress_bar=True, gpu=False)
+
+            if self.quantize:
+                # Quantised kernels are CPU-only, so stay off MPS
+                from src.quantize import quantize_xtts
+                quantize_xtts(self.tts.synthesizer.tts_model)
+                print(f"✓ Quantised to int8 (CPU, {torch.get_num_threads()} threads)")
+            elif self.device and self.device != "cpu":
+                print(f"✓ Using {self.device}")
+                self.tts.to(self.device)
+            # Manually move to MPS if available
+            elif self.device is None and torch.backends.mps.is_available():
+                print("✓ Using MPS (Apple Silicon) acceleration")
+                self.tts.to("mps")
+
+        # The vocoder runs inside model.inference(); hooks let it be timed separately from GPT decoding
+        vocoder = getattr(self.tts.synthesizer.tts_model, "hifigan_decoder", None)
+        if vocoder is not None:
+            tracing.instrument_module(vocoder, "synthesis.vocoder")
+
+    def to_cpu(self):
+        if self.tts is not None:
+            self.tts.to("cpu")
+
+    def unload(self):
+        import gc
+        import torch
+
+        self.tts = None
+        gc.collect()
+        if torch.backends.mps.is_available():
+            torch.mps.empty_cache()
+
+    def memory_bytes(self) -> Optional[int]:
+        if self.tts is None or self.quantize:
+            return None  # Packed int8 weights aren't parameters, so let the caller measure the process
+        synthesizer = self.tts.synthesizer
+        modules = [m for m in (synthesizer.tts_model, getattr(synthesizer, "vocoder_model", None)) if m is not None]
+        return sum(t.numel() * t.element_size() for m in modules for t in list(m.parameters()) + list(m.buffers()))
+
+    def seed(self, seed: int):
+        import torch
+        torch.manual_seed(seed)
+
+    def compute_latents(self, reference_audio_path: str) -> Dict:
+        """
+        Encode a reference clip into XTTS conditioning latents.
+        This is the expensive step tts_to_file repeats on every call.
+        """
+        self.ensure_loaded()
+        model = self.tts.synthesizer.tts_model
+        if not hasattr(model, "get_conditioning_latents"):
+            return super().compute_latents(reference_audio_path)
+        with tracing.span("conditioning"):
+            gpt_cond_latent, speaker_embedding = model.get_conditioning_latents(audio_path=[reference_audio_path])
+        return {
+            "gpt_cond_latent": gpt_cond_latent,
+            "speaker_embedding": speaker_embedding,
+        }
+
+    def save_latents(self, latents: Dict, path: str):
+        import torch
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        torch.save({k: v.cpu() if torch.is_tensor(v) else v for k, v in latents.items()}, tmp_path)
+        os.replace(tmp_path, path)
+
+    def load_latents(self, path: str) -> Optional[Dict]:
+        import torch
+
+        try:
+            return torch.load(path, map_location="cpu")
+        except Exception as e:
+            print(f"Warning: Could not load cached latents {path}: {e}")
+            return None
+
+    def _latent_inputs(self, latents: Dict) -> Dict:
+        model = self.tts.synthesizer.tts_model
+        device = next(model.parameters()).device
+        return {
+            "gpt_cond_latent": latents["gpt_cond_latent"].to(device),
+            "speaker_embedding": latents["speaker_embedding"].to(device),
+        }
+
+    def synthesize(self, text: str, language: str = "en", latents: Optional[Dict] = None,
+                   reference_audio_path: Optional[str] = None) -> np.ndarray:
+        self.ensure_loaded()
+        if latents:
+            # Precomputed conditioning: skip reloading and re-encoding the reference
+            model = self.tts.synthesizer.tts_model
+            with tracing.span("synthesis.inference") as inference:
+                out = model.inference(
+                    text=text,
+                    language=language,
+                    enable_text_splitting=True,
+                    **self._latent_inputs(latents),
+                    **self.config
+                )
+            if tracing.enabled():
+                # Whatever inference() spent outside the vocoder went to GPT decoding
+                tracing.emit("synthesis.gpt", inference.duration - inference.children.get("synthesis.vocoder", 0.0),
+                             parent="synthesis.inference")
+            wav = out["wav"]
+        else:
+            kwargs = dict(self.config)
+            if reference_audio_path and self.capabilities.cloning:
+                kwargs["speaker_wav"] = reference_audio_path
+            if self.tts.is_multi_lingual:
+                kwargs["language"] = language
+            with tracing.span("synthesis.tts"):
+                wav = self.tts.tts(text=text, **kwargs)
+        if hasattr(wav, "detach"):
+            wav = wav.detach().cpu().numpy()
+        return np.asarray(wav, dtype=np.float32).squeeze()
+
+    def stream(self, text: str, language: str = "en", latents: Optional[Dict] = None,
+               chunk_size: int = 20) -> Iterator[np.ndarray]:
+        self.ensure_loaded()
+        model = self.tts.synthesizer.tts_model
+        if not latents or not hasattr(model, "inference_stream"):
+            yield from super().stream(text, language, latents, chunk_size)
+            return
+        chunks = model.inference_stream(
+            text=text,
+            language=language,
+            stream_chunk_size=chunk_size,
+            enable_text_splitting=True,
+            **self._latent_inputs(latents),
+            **self.config
+        )
+        for chunk in chunks:
+            yield chunk.detach().cpu().numpy()
+
+    def postprocess(self, wav: np.ndarray) -> np.ndarray:
+        # Peak-normalise like Coqui's own save_wav, which the rest of the tool has always relied on
+        return wav / max(0.01, float(np.max(np.abs(wav)))) if len(wav) else wav
@@ -0,0 +1,90 @@
+import os
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional
+from src import tracing
+from src.backends.base import Backend, Capabilities
+
+
+class OnnxVitsBackend(Backend):
+    """
+    VITS exported to ONNX (Coqui's `Vits.export_onnx`), run with ONNX Runtime on CPU.
+
+    Much lower latency than XTTS on CPU, but no cloning: it speaks in the exported
+    model's own voice(s). Text is tokenised with the model's Coqui config, looked up
+    as 'config.json' next to the .onnx file (or '<model>.json').
+    """
+
+    def __init__(self, model_name: str, threads: Optional[int] = None, speaker_id: int = 0, **_ignored):
+        super().__init__(model_name, threads, "cpu")
+        self.model_path = Path(model_name)
+        self.speaker_id = speaker_id
+        self.session = None
+        self.tokenizer = None
+        self.model_config = None
+
+    @property
+    def model_id(self) -> str:
+        return f"onnx:{self.model_path.name}"
+
+    @property
+    def loaded(self) -> bool:
+        return self.session is not None
+
+    def _config_path(self) -> Path:
+        for candidate in (self.model_path.with_suffix(".json"), self.model_path.parent / "config.json"):
+            if candidate.exists():
+                return candidate
+        raise FileNotFoundError(f"No config.json found for {self.model_path}")
+
+    @property
+    def capabilities(self) -> Capabilities:
+        self.ensure_loaded()
+        language = self.model_config.get("phoneme_language") or "en"
+        return Capabilities(cloning=False, streaming=False, languages=[language.split("-")[0]],
+                            sample_rate=self.model_config.audio["sample_rate"])
+
+    def load(self):
+        if self.session is not None:
+            return
+        import onnxruntime as ort
+        from TTS.config import load_config
+        from TTS.tts.utils.text.tokenizer import TTSTokenizer
+
+        print(f"⏳ Loading ONNX model: {self.model_path}...")
+        with tracing.span("model.load", model=self.model_id):
+            self.model_config = load_config(str(self._config_path()))
+            self.tokenizer, self.model_config = TTSTokenizer.init_from_config(self.model_config)
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = self.threads or os.cpu_count() or 1
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            self.session = ort.InferenceSession(str(self.model_path), sess_options=options,
+                                                providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def unload(self):
+        self.session = None
+
+    def memory_bytes(self) -> Optional[int]:
+        # ONNX Runtime holds roughly the serialised weights
+        return self.model_path.stat().st_size if self.session is not None else None
+
+    def synthesize(self, text: str, language: str = "en", latents: Optional[Dict] = None,
+                   reference_audio_path: Optional[str] = None) -> np.ndarray:
+        self.ensure_loaded()
+        args = self.model_config.model_args
+        ids = np.asarray([self.tokenizer.text_to_ids(text)], dtype=np.int64)
+        inputs = {
+            "input": ids,
+            "input_lengths": np.asarray([ids.shape[1]], dtype=np.int64),
+            # Same order as Vits.inference_onnx: noise scale, length scale, duration-predictor noise
+            "scales": np.asarray([args.inference_noise_scale, args.length_scale, args.inference_noise_scale_dp],
+                                 dtype=np.float32),
+        }
+        if "sid" in self.input_names:
+            inputs["sid"] = np.asarray([self.speaker_id], dtype=np.int64)
+        if "langid" in self.input_names:
+            inputs["langid"] = np.asarray([0], dtype=np.int64)
+        with tracing.span("synthesis.inference"):
+            audio = self.session.run(["output"], inputs)[0]
+        return np.asarray(audio, dtype=np.float32).squeeze()
@@ -0,0 +1,86 @@
+import hashlib
+import time
+import numpy as np
+from typing import Dict, Optional
+from src.backends.base import Backend, Capabilities
+
+STUB_MODEL = "stub"
+STUB_SAMPLE_RATE = 24000
+SECONDS_PER_CHAR = 0.065    # Roughly conversational speech rate
+
+
+def _rng(*parts) -> np.random.Generator:
+    digest = hashlib.sha256("\x00".join(str(p) for p in parts).encode("utf-8")).digest()
+    return np.random.default_rng(int.from_bytes(digest[:8], "little"))
+
+
+class StubBackend(Backend):
+    """
+    Deterministic stand-in model that needs no weights, torch or network.
+
+    "Latents" are a spectral fingerprint of the reference audio, and speech is a
+    tone/noise signal whose length follows the text. The same text, voice and
+    seed always render identical audio, so everything around the model (file
+    handling, caching, refine, batching) can be benchmarked and exercised
+    anywhere. `rtf` optionally simulates model compute time.
+    """
+
+    def __init__(self, model_name: str = STUB_MODEL, rtf: float = 0.0, **_ignored):
+        super().__init__(model_name)
+        self.rtf = rtf
+        self._loaded = False
+        self._seed = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def capabilities(self) -> Capabilities:
+        return Capabilities(cloning=True, streaming=False, languages=None, sample_rate=STUB_SAMPLE_RATE)
+
+    def load(self):
+        self._loaded = True
+
+    def unload(self):
+        self._loaded = False
+
+    def memory_bytes(self) -> Optional[int]:
+        return 0
+
+    def seed(self, seed: int):
+        self._seed = seed
+
+    def compute_latents(self, reference_audio_path: str) -> Dict:
+        from src.audio import read_wav
+
+        sr, audio = read_wav(reference_audio_path)
+        x = np.asarray(audio, dtype=np.float32)
+        if x.ndim > 1:
+            x = x.mean(axis=1)
+        # A coarse spectral fingerprint stands in for the speaker embedding
+        spectrum = np.abs(np.fft.rfft(x[:sr * 10], n=1024))
+        embedding = (spectrum / (np.linalg.norm(spectrum) + 1e-12)).astype(np.float32)
+        return {"gpt_cond_latent": embedding[None, :], "speaker_embedding": embedding[:512, None]}
+
+    def synthesize(self, text: str, language: str = "en", latents: Optional[Dict] = None,
+                   reference_audio_path: Optional[str] = None) -> np.ndarray:
+        """Voiced tone per word with a little noise, pitched by the voice and the seed."""
+        voice = float(latents["speaker_embedding"].sum()) if latents else reference_audio_path or ""
+        rng = _rng(text, language, voice, self._seed)
+        self._seed = None
+        total = max(1, int(len(text) * SECONDS_PER_CHAR * STUB_SAMPLE_RATE))
+        out = np.zeros(total, dtype=np.float32)
+        words = text.split() or [text]
+        bounds = np.linspace(0, total, len(words) + 1).astype(int)
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            n = end - start
+            if n <= 0:
+                continue
+            t = np.arange(n, dtype=np.float32) / STUB_SAMPLE_RATE
+            pitch = rng.uniform(90.0, 220.0)
+            out[start:end] = 0.3 * np.hanning(n).astype(np.float32) * np.sin(2 * np.pi * pitch * t)
+        out += 0.01 * rng.standard_normal(total).astype(np.float32)
+        if self.rtf:
+            time.sleep(self.rtf * total / STUB_SAMPLE_RATE)
+        return out
@@ -0,0 +1,192 @@
+import csv
+import json
+import time
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from src import encode
+
+REQUIRED_FIELDS = ("voice", "text", "output")
+
+
+def load_manifest(path: str) -> List[Dict]:
+    """
+    Read a batch manifest of speak jobs.
+    Accepts JSONL (one object per line) or CSV with a header row; each job needs
+    'voice', 'text' and 'output', and may set 'language' (default 'en') and 'seed'.
+    """
+    manifest = Path(path)
+    jobs = []
+    with open(manifest, 'r', encoding='utf-8', newline='') as f:
+        if manifest.suffix.lower() == ".csv":
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    for line_no, row in enumerate(rows, start=1):
+        missing = [k for k in REQUIRED_FIELDS if not row.get(k)]
+        if missing:
+            raise ValueError(f"{manifest.name} entry {line_no} is missing {', '.join(missing)}")
+        jobs.append({
+            "voice": row["voice"],
+            "text": row["text"],
+            "language": row.get("language") or "en",
+            "output": row["output"],
+            "seed": int(row["seed"]) if row.get("seed") not in (None, "") else None,
+        })
+    return jobs
+
+
+def audio_duration(path: str) -> float:
+    """Duration of a WAV (or FLAC/Opus) file in seconds (0.0 if it cannot be read)."""
+    return encode.duration(path)
+
+
+class BatchRunner:
+    """
+    Renders a manifest of speak jobs with a single loaded model.
+
+    Jobs are grouped by (voice, language) so each reference is encoded once, and
+    every finished output is appended to a progress log so an interrupted run can
+    be resumed without redoing completed lines. With a WorkerPool, jobs are
+    spread across its workers instead of run in this process.
+    """
+
+    def __init__(self, manager, synthesizer, progress_path: Optional[str] = None, seed: Optional[int] = None,
+                 pool=None):
+        self.manager = manager
+        self.synthesizer = synthesizer
+        self.seed = seed
+        self.pool = pool
+        self.progress_path = Path(progress_path) if progress_path else None
+
+    def _completed(self) -> Set[str]:
+        done = set()
+        if self.progress_path and self.progress_path.exists():
+            with open(self.progress_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        done.add(json.loads(line)["output"])
+                    except (ValueError, KeyError):
+                        continue  # Tolerate a half-written last line after a crash
+        return {out for out in done if Path(out).exists()}
+
+    def _record(self, entry: Dict):
+        if not self.progress_path:
+            return
+        with open(self.progress_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def run(self, jobs: List[Dict]) -> Dict:
+        completed = self._completed()
+        pending = [job for job in jobs if job["output"] not in completed]
+        summary = {
+            "total": len(jobs),
+            "skipped": len(jobs) - len(pending),
+            "done": 0,
+            "failed": 0,
+            "characters": 0,
+            "audio_seconds": 0.0,
+            "synthesis_seconds": 0.0,
+            "load_seconds": 0.0,
+            "wall_seconds": 0.0,
+        }
+        if not pending:
+            return self._finish(summary)
+        start = time.perf_counter()
+        if self.pool is not None:
+            self._run_pool(pending, summary)
+            summary["wall_seconds"] = time.perf_counter() - start
+            return self._finish(summary)
+
+        pending.sort(key=lambda job: (job["voice"], job["language"]))
+        latents_by_voice = {}
+        for (voice, language), group in groupby(pending, key=lambda job: (job["voice"], job["language"])):
+            group = list(group)
+            ref_audio = self.manager.get_reference_audio(voice)
+            if not ref_audio:
+                print(f"❌ Voice '{voice}' has no reference audio, skipping {len(group)} jobs")
+                summary["failed"] += len(group)
+                continue
+            synthesizer = self.synthesizer.using(self.manager.get_base_model(voice))
+            ref_hash = self.manager.get_reference_hash(voice)
+
+            for job in group:
+                Path(job["output"]).parent.mkdir(parents=True, exist_ok=True)
+                seed = job["seed"] if job["seed"] is not None else self.seed
+                try:
+                    # Cached outputs need neither the model nor latents, so load both on first need
+                    latents = None
+                    if not synthesizer.is_cached(job["text"], ref_audio, language, seed,
+                                                 encode.format_for_path(job["output"]), ref_hash):
+                        load_start = time.perf_counter()
+                        synthesizer.load_model()
+                        summary["load_seconds"] += time.perf_counter() - load_start
+                        if voice not in latents_by_voice:
+                            latents_by_voice[voice] = self.manager.get_conditioning_latents(voice, synthesizer)
+                        latents = latents_by_voice[voice]
+                    t0 = time.perf_counter()
+                    synthesizer.speak(
+                        text=job["text"],
+                        output_path=job["output"],
+                        reference_audio_path=ref_audio,
+                        language=language,
+                        latents=latents,
+                        seed=seed,
+                        reference_hash=ref_hash
+                    )
+                except Exception as e:
+                    print(f"❌ Failed {job['output']}: {e}")
+                    summary["failed"] += 1
+                    continue
+                elapsed = time.perf_counter() - t0
+                seconds = audio_duration(job["output"])
+
+                summary["done"] += 1
+                summary["characters"] += len(job["text"])
+                summary["audio_seconds"] += seconds
+                summary["synthesis_seconds"] += elapsed
+                self._record({"output": job["output"], "characters": len(job["text"]),
+                              "audio_seconds": round(seconds, 3), "elapsed": round(elapsed, 3)})
+                print(f"✓ [{summary['skipped'] + summary['done']}/{summary['total']}] {job['output']}")
+
+        summary["wall_seconds"] = time.perf_counter() - start
+        return self._finish(summary)
+
+    def _run_pool(self, pending: List[Dict], summary: Dict):
+        jobs = [dict(job, seed=job["seed"] if job["seed"] is not None else self.seed) for job in pending]
+        self.pool.start(jobs)
+        summary["load_seconds"] = self.pool.load_seconds
+        summary["parent_memory"] = self.pool.parent_memory
+        workers = summary["workers"] = {}
+        for result in self.pool.imap(jobs):
+            job = jobs[result["id"]]
+            stats = workers.setdefault(result["worker"], {"jobs": 0, "failed": 0, "busy_seconds": 0.0,
+                                                          "audio_seconds": 0.0, "memory": {}})
+            stats["busy_seconds"] += result["elapsed"]
+            stats["memory"] = result["memory"]
+            if result["error"]:
+                print(f"❌ Failed {job['output']}: {result['error']}")
+                summary["failed"] += 1
+                stats["failed"] += 1
+                continue
+            stats["jobs"] += 1
+            stats["audio_seconds"] += result["audio_seconds"]
+            summary["done"] += 1
+            summary["characters"] += len(job["text"])
+            summary["audio_seconds"] += result["audio_seconds"]
+            summary["synthesis_seconds"] += result["elapsed"]
+            self._record({"output": job["output"], "characters": len(job["text"]),
+                          "audio_seconds": round(result["audio_seconds"], 3), "elapsed": round(result["elapsed"], 3),
+                          "worker": result["worker"]})
+            print(f"✓ [{summary['skipped'] + summary['done']}/{summary['total']}] (worker {result['worker']}) {job['output']}")
+
+    def _finish(self, summary: Dict) -> Dict:
+        synth = summary["synthesis_seconds"]
+        summary["chars_per_second"] = summary["characters"] / synth if synth else 0.0
+        # Real-time factor: compute time per second of audio (< 1.0 is faster than real time)
+        summary["real_time_factor"] = synth / summary["audio_seconds"] if summary["audio_seconds"] else 0.0
+        # Aggregate throughput: seconds of audio produced per wall-clock second (all workers together)
+        wall = summary["wall_seconds"]
+        summary["audio_per_wall_second"] = summary["audio_seconds"] / wall if wall else 0.0
+        return summary
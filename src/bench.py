@@ -0,0 +1,183 @@
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BENCH_TEXT = ("The quick brown fox jumps over the lazy dog. Pack my box with five dozen liquor jugs. "
+              "How vexingly quick daft zebras jump! Sphinx of black quartz, judge my vow. ")
+DEFAULT_LENGTHS = (50, 200, 800)
+DEFAULT_CLIP_COUNTS = (1, 4, 16)
+CLIP_SECONDS = 6.0
+
+# Every metric is in seconds (or seconds per second, for RTF), so lower is always better.
+# Changes smaller than this are treated as timer noise regardless of the relative change.
+MIN_DELTA = 0.005
+
+
+def _median_time(fn: Callable, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench_text(length: int) -> str:
+    """Deterministic text of exactly `length` characters."""
+    repeats = length // len(BENCH_TEXT) + 1
+    return (BENCH_TEXT * repeats)[:length].rstrip() or "."
+
+
+def synthetic_clip(path: str, seconds: float, seed: int, sample_rate: int = 22050):
+    """Write a speech-like test clip: voiced bursts separated by pauses, over low noise."""
+    import numpy as np
+    from scipy.io import wavfile
+
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sample_rate)
+    audio = 0.003 * rng.standard_normal(n)
+    t = np.arange(n) / sample_rate
+    start = int(0.3 * sample_rate)
+    while start < n - sample_rate // 2:
+        length = int(rng.uniform(0.4, 1.2) * sample_rate)
+        end = min(n, start + length)
+        pitch = rng.uniform(100, 200)
+        audio[start:end] += 0.3 * np.hanning(end - start) * np.sin(2 * np.pi * pitch * t[start:end])
+        start = end + int(rng.uniform(0.1, 0.6) * sample_rate)
+    wavfile.write(path, sample_rate, (audio.clip(-1, 1) * 32767).astype(np.int16))
+
+
+def bench_startup(runs: int = 5) -> Dict[str, float]:
+    """Median wall time of a bare interpreter and of the CLI's fastest path."""
+    def run(*cmd):
+        subprocess.run([sys.executable, *cmd], cwd=REPO_ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    return {
+        "startup.interpreter": _median_time(lambda: run("-c", "pass"), runs),
+        "startup.cli_help": _median_time(lambda: run("-m", "src.cli", "--help"), runs),
+        "startup.import_manager": _median_time(lambda: run("-c", "import src.manager"), runs),
+    }
+
+
+def bench_refine(work_dir: Path, clip_counts: Sequence[int] = DEFAULT_CLIP_COUNTS) -> Dict[str, float]:
+    """process_audio on fresh voices with N synthetic clips: cold, then the no-change rerun."""
+    from src.manager import VoiceManager
+
+    results = {}
+    with open(os.devnull, 'w') as quiet, contextlib.redirect_stdout(quiet):
+        manager = VoiceManager(str(work_dir / "voices"))
+        for count in clip_counts:
+            name = f"bench-{count}"
+            manager.create_voice(name)
+            audio_dir = Path(manager.get_voice_path(name)) / "audio"
+            for i in range(count):
+                synthetic_clip(str(audio_dir / f"sample_{i + 1:03d}.wav"), CLIP_SECONDS, seed=i)
+            start = time.perf_counter()
+            manager.process_audio(name)
+            results[f"refine.{count}_clips.cold"] = time.perf_counter() - start
+            start = time.perf_counter()
+            manager.process_audio(name)
+            results[f"refine.{count}_clips.unchanged"] = time.perf_counter() - start
+    return results
+
+
+def bench_model(synthesizer, reference: str, lengths: Sequence[int] = DEFAULT_LENGTHS, runs: int = 3,
+                work_dir: Optional[Path] = None) -> Dict[str, float]:
+    """Model load, reference conditioning, and synthesis RTF at several text lengths."""
+    from src.batch import audio_duration
+
+    work_dir = work_dir or Path(tempfile.mkdtemp())
+    results = {}
+    start = time.perf_counter()
+    synthesizer.load_model()
+    results["model.load"] = time.perf_counter() - start
+
+    latents = synthesizer.compute_latents(reference)  # Warm-up
+    results["model.conditioning"] = _median_time(lambda: synthesizer.compute_latents(reference), runs)
+
+    output = str(work_dir / "bench.wav")
+    for length in lengths:
+        text = bench_text(length)
+        elapsed = _median_time(lambda: synthesizer.speak(text=text, output_path=output, reference_audio_path=reference,
+                                                         latents=latents, seed=0), runs)
+        seconds = audio_duration(output)
+        results[f"synthesis.{length}_chars.seconds"] = elapsed
+        results[f"synthesis.{length}_chars.rtf"] = elapsed / seconds if seconds else 0.0
+    return results
+
+
+def run_suite(synthesizer, stages: Sequence[str] = ("startup", "refine", "model"),
+              lengths: Sequence[int] = DEFAULT_LENGTHS, clip_counts: Sequence[int] = DEFAULT_CLIP_COUNTS,
+              reference: Optional[str] = None, runs: int = 3) -> Dict:
+    """
+    Run the selected benchmark stages and return {"meta": ..., "metrics": {name: seconds}}.
+    Without a reference, the model stage conditions on a synthetic clip.
+    """
+    metrics = {}
+    with tempfile.TemporaryDirectory(prefix="voice-bench-") as tmp:
+        work_dir = Path(tmp)
+        if "startup" in stages:
+            print("⏱️  Startup...")
+            metrics.update(bench_startup(runs=max(runs, 5)))
+        if "refine" in stages:
+            print("⏱️  Refine...")
+            metrics.update(bench_refine(work_dir, clip_counts))
+        if "model" in stages:
+            print(f"⏱️  Model ({synthesizer.model_id})...")
+            if not reference:
+                reference = str(work_dir / "reference.wav")
+                synthetic_clip(reference, 10.0, seed=42)
+            metrics.update(bench_model(synthesizer, reference, lengths, runs, work_dir))
+
+    return {
+        "meta": {
+            "model": synthesizer.model_id,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "metrics": metrics,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = 0.10) -> List[Dict]:
+    """
+    Compare metrics present in both runs. A metric regresses when it is more than
+    `tolerance` (relative) and MIN_DELTA (absolute) slower than the baseline.
+    """
+    rows = []
+    old_metrics = baseline.get("metrics", {})
+    for name, new in sorted(results["metrics"].items()):
+        old = old_metrics.get(name)
+        if old is None:
+            continue
+        change = (new - old) / old if old else 0.0
+        rows.append({
+            "metric": name,
+            "baseline": old,
+            "current": new,
+            "change": change,
+            "regression": change > tolerance and new - old > MIN_DELTA,
+        })
+    return rows
+
+
+def save(results: Dict, path: str):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=4)
+
+
+def load(path: str) -> Dict:
+    with open(path, 'r') as f:
+        return json.load(f)
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterator
+
+
+# Stores between full rescans of the cache size, so entries added by other processes are noticed
+RESCAN_EVERY = 256
+
+
+class SynthesisCache:
+    """
+    On-disk cache of rendered audio, addressed by everything that determines the output.
+
+    Entries keep their format's extension ('{key}.flac', ...). They are evicted
+    least-recently-used first (by mtime, refreshed on every hit) once the cache
+    grows past `max_bytes`. The size is tracked as entries are stored, so the
+    directory is only walked when the budget is exceeded (or every RESCAN_EVERY
+    stores). Hit/miss counters persist in 'stats.json'.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 1024 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._stats_path = self.cache_dir / "stats.json"
+        self._bytes = None          # Running total; None until the first scan
+        self._stores = 0
+
+    @staticmethod
+    def make_key(model_name: str, reference_hash: str, text: str, language: str,
+                 config: Dict, seed: int) -> str:
+        payload = json.dumps({
+            "model": model_name,
+            "reference": reference_hash,
+            "text": text,
+            "language": language,
+            "config": config,
+            "seed": seed,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str, format: str = "wav") -> Path:
+        return self.cache_dir / key[:2] / f"{key}.{format}"
+
+    def _entries(self) -> Iterator[Path]:
+        return (p for p in self.cache_dir.glob("*/*") if p.suffix != ".tmp")
+
+    def contains(self, key: str, format: str = "wav") -> bool:
+        return self._entry(key, format).exists()
+
+    def fetch(self, key: str, output_path: str, format: str = "wav") -> bool:
+        """Copy a cached entry to output_path. Returns False on a miss."""
+        entry = self._entry(key, format)
+        if not entry.exists():
+            self._count("misses")
+            return False
+        shutil.copyfile(entry, output_path)
+        os.utime(entry)  # Mark as recently used
+        self._count("hits")
+        return True
+
+    def store(self, key: str, source_path: str, format: str = "wav"):
+        """Add a rendered file to the cache, then evict down to the size budget if it's exceeded."""
+        entry = self._entry(key, format)
+        entry.parent.mkdir(exist_ok=True)
+        tmp = entry.with_suffix(".tmp")
+        shutil.copyfile(source_path, tmp)
+        replaced = entry.stat().st_size if entry.exists() else 0
+        os.replace(tmp, entry)
+        self._stores += 1
+        if self._bytes is None or self._stores % RESCAN_EVERY == 0:
+            self._bytes = sum(p.stat().st_size for p in self._entries())
+        else:
+            self._bytes += entry.stat().st_size - replaced
+        if self._bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits its budget."""
+        entries = [(p.stat(), p) for p in self._entries()]
+        total = sum(st.st_size for st, _ in entries)
+        self._bytes = total
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for st, path in sorted(entries, key=lambda e: e[0].st_mtime):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= st.st_size
+            evicted += 1
+        self._bytes = total
+        self._count("evictions", evicted)
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir)
+        self.cache_dir.mkdir(parents=True)
+        self._bytes = 0
+
+    def stats(self) -> Dict:
+        stats = self._load_stats()
+        sizes = [p.stat().st_size for p in self._entries()]
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "entries": len(sizes),
+            "bytes": sum(sizes),
+            "max_bytes": self.max_bytes,
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+        })
+        return stats
+
+    def _load_stats(self) -> Dict:
+        stats = {"hits": 0, "misses": 0, "evictions": 0}
+        if self._stats_path.exists():
+            try:
+                with open(self._stats_path, 'r') as f:
+                    stats.update(json.load(f))
+            except (OSError, ValueError):
+                pass
+        return stats
+
+    def _count(self, field: str, n: int = 1):
+        if not n:
+            return
+        stats = self._load_stats()
+        stats[field] += n
+        with open(self._stats_path, 'w') as f:
+            json.dump(stats, f)
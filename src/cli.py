@@ -1,15 +1,49 @@
 
 import argparse
+import contextlib
 import sys
 from pathlib import Path
 from src.manager import VoiceManager
-from src.synthesis import Synthesizer
-from src.recorder import AudioRecorder
+from src.cache import SynthesisCache
+from src.server import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_URL
+
+# torch, TTS and sounddevice take seconds to import, so only the commands that
+# need them import them (inside their branches below). Keep it that way: 'list'
+# and 'new' should start in well under 150 ms.
+
+def make_synthesizer(args, manager: VoiceManager):
+    """Build a Synthesizer wired to the output cache selected on the command line."""
+    from src.synthesis import Synthesizer
+
+    cache = None
+    if not args.no_cache:
+        cache = SynthesisCache(args.cache_dir or manager.base_dir / ".cache", max_bytes=args.cache_size * 1024 * 1024)
+    return Synthesizer(cache=cache, quantize=args.quantize, threads=args.threads, interop_threads=args.interop_threads,
+                       device=args.device)
 
 def main():
     parser = argparse.ArgumentParser(description="Voice Cloning Management System")
+    parser.add_argument("--trace", action="store_true", help="Log per-stage timings to stderr as JSON lines")
+    parser.add_argument("--trace-file", type=str, default=None, metavar="FILE", help="Append per-stage timing JSON lines to FILE")
+    parser.add_argument("--model-budget", type=float, default=None, metavar="MB",
+                        help="Unload least recently used models when loaded models exceed this much RAM")
+    parser.add_argument("--metrics-out", type=str, default=None, metavar="FILE",
+                        help="Write per-stage timing histograms in Prometheus text format on exit")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
+    # Shared output-cache options
+    cache_args = argparse.ArgumentParser(add_help=False)
+    cache_args.add_argument("--cache-dir", type=str, default=None, help="Synthesis cache directory (default: voices/.cache)")
+    cache_args.add_argument("--cache-size", type=int, default=1024, help="Synthesis cache budget in MB")
+    cache_args.add_argument("--no-cache", action="store_true", help="Disable the synthesis output cache")
+
+    # Shared inference options
+    engine_args = argparse.ArgumentParser(add_help=False)
+    engine_args.add_argument("--quantize", action="store_true", help="Dynamic int8 quantisation (CPU only; faster, slightly different audio)")
+    engine_args.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    engine_args.add_argument("--interop-threads", type=int, default=None, help="torch inter-op threads")
+    engine_args.add_argument("--device", type=str, default=None, help="Run the model on this torch device (cpu, mps, cuda; default: MPS if available)")
+
     # Command: NEW
     parser_new = subparsers.add_parser("new", help="Create a new voice profile")
     parser_new.add_argument("name", type=str, help="Name of the voice")
@@ -18,24 +52,231 @@ def main():
     # Command: RECORD
     parser_rec = subparsers.add_parser("record", help="Record audio samples")
     parser_rec.add_argument("voice", type=str, help="Name of the voice")
-    parser_rec.add_argument("--duration", type=int, default=5, help="Duration in seconds")
+    parser_rec.add_argument("--duration", type=int, default=5, help="Maximum duration in seconds")
+    parser_rec.add_argument("--auto-stop", type=float, default=None, metavar="SECONDS", help="Stop after this much silence following speech")
+    parser_rec.add_argument("--no-trim", action="store_true", help="Keep leading/trailing silence in the saved clip")
     
     # Command: REFINE
     parser_refine = subparsers.add_parser("refine", help="Process recordings into a master reference")
     parser_refine.add_argument("voice", type=str, help="Name of the voice")
+    parser_refine.add_argument("--max-seconds", type=float, default=None, help="Cap on reference speech length (saved per voice, default 30)")
+
+    # Command: INGEST
+    parser_ingest = subparsers.add_parser("ingest", help="Onboard many speakers from a directory tree or manifest")
+    parser_ingest.add_argument("source", type=str, help="Directory with one sub-directory per speaker, or a JSONL/CSV manifest of speaker,path")
+    parser_ingest.add_argument("--workers", type=int, default=None, help="Voices processed in parallel (default: CPU count)")
+    parser_ingest.add_argument("--max-seconds", type=float, default=None, help="Cap on each reference's speech length (default 30)")
+    parser_ingest.add_argument("--report", type=str, default=None, help="Write the run summary to this JSON file")
+
+    # Command: SIMILAR
+    parser_similar = subparsers.add_parser("similar", help="Find the stored voices that sound most like a voice or clip",
+                                           parents=[engine_args])
+    parser_similar.add_argument("query", type=str, help="Voice name, or path to an audio clip")
+    parser_similar.add_argument("--top", type=int, default=5, help="Number of matches to show")
+    parser_similar.add_argument("--model", type=str, default=None, help="Model whose speaker embeddings to compare (default: the voice's, else xtts_v2)")
+    parser_similar.add_argument("--no-update", action="store_true", help="Search the index as it is, without indexing new or changed voices first")
 
     # Command: LIST
     parser_list = subparsers.add_parser("list", help="List all voice profiles")
+    parser_list.add_argument("--filter", type=str, default=None, help="Only show voices whose name, ID or description contains this")
+    parser_list.add_argument("--limit", type=int, default=None, help="Maximum number of voices to show")
+    parser_list.add_argument("--offset", type=int, default=0, help="Number of voices to skip (for paging)")
+
+    # Command: REINDEX
+    parser_reindex = subparsers.add_parser("reindex", help="Rebuild the voice registry from the voices directory")
 
     # Command: SPEAK
-    parser_speak = subparsers.add_parser("speak", help="Generate speech")
+    parser_speak = subparsers.add_parser("speak", help="Generate speech", parents=[cache_args, engine_args])
     parser_speak.add_argument("voice", type=str, help="Name of the voice to use")
     parser_speak.add_argument("text", type=str, help="Text to speak")
     parser_speak.add_argument("--lang", type=str, default="en", help="Language code (en, es, fr, etc.)")
     parser_speak.add_argument("--out", type=str, default="output.wav", help="Output filename")
+    parser_speak.add_argument("--server", type=str, default=DEFAULT_URL, help="Synthesis server to use if one is running")
+    parser_speak.add_argument("--local", action="store_true", help="Always synthesize in-process, never via a server")
+    parser_speak.add_argument("--timeout", type=float, default=None, help="Per-request timeout in seconds when using a server")
+    parser_speak.add_argument("--seed", type=int, default=None, help="Random seed; makes output reproducible and cacheable")
+    parser_speak.add_argument("--stream", action="store_true", help="Stream audio as it is generated ('--out -' writes raw 16-bit PCM to stdout)")
+    parser_speak.add_argument("--format", type=str, choices=["wav", "flac", "opus", "pcm"], default=None,
+                              help="Output encoding (default: from --out's extension; raw PCM for '--out -')")
+
+    # Command: SPEAK-LONG
+    parser_long = subparsers.add_parser("speak-long", help="Render a long text or .txt/.md document sentence by sentence",
+                                        parents=[engine_args])
+    parser_long.add_argument("voice", type=str, help="Name of the voice to use")
+    parser_long.add_argument("source", type=str, help="A .txt/.md file, or the text itself")
+    parser_long.add_argument("--lang", type=str, default="en", help="Language code (en, es, fr, etc.)")
+    parser_long.add_argument("--out", type=str, default="output.wav", help="Output filename")
+    parser_long.add_argument("--seed", type=int, default=None, help="Random seed; makes output reproducible")
+    parser_long.add_argument("--max-chars", type=int, default=None, help="Override the per-language chunk length limit")
+    parser_long.add_argument("--crossfade-ms", type=int, default=20, help="Crossfade between sentence chunks")
+    parser_long.add_argument("--report", type=str, default=None, help="Write per-chunk timings to this JSON file")
+    parser_long.add_argument("--format", type=str, choices=["wav", "flac", "opus", "pcm"], default=None,
+                             help="Output encoding (default: from --out's extension)")
+
+    # Command: SPEAK-BATCH
+    parser_batch = subparsers.add_parser("speak-batch", help="Render a JSONL/CSV manifest of speak jobs with one model load",
+                                         parents=[cache_args, engine_args])
+    parser_batch.add_argument("manifest", type=str, help="Manifest with voice, text, language, output per entry")
+    parser_batch.add_argument("--seed", type=int, default=None, help="Seed for entries that do not set their own")
+    parser_batch.add_argument("--progress", type=str, default=None, help="Progress log for resuming (default: <manifest>.progress.jsonl)")
+    parser_batch.add_argument("--workers", type=int, default=1, help="Forked worker processes sharing one model (Linux, CPU)")
+    parser_batch.add_argument("--threads-per-worker", type=int, default=None, help="torch threads per worker (default: its core count)")
+
+    # Command: SERVE
+    parser_serve = subparsers.add_parser("serve", help="Keep the model loaded and serve speak requests",
+                                         parents=[cache_args, engine_args])
+    parser_serve.add_argument("--host", type=str, default=DEFAULT_HOST, help="Interface to bind")
+    parser_serve.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser_serve.add_argument("--queue-size", type=int, default=8, help="Max pending requests before rejecting")
+    parser_serve.add_argument("--timeout", type=float, default=120.0, help="Default per-request timeout in seconds")
+    parser_serve.add_argument("--output-dir", type=str, default=None,
+                              help="Only write requested output files under this directory (default: current directory)")
+
+    # Command: QUANTIZE-REPORT
+    parser_quant = subparsers.add_parser("quantize-report", help="Compare fp32 and int8 synthesis speed, memory and output")
+    parser_quant.add_argument("voice", type=str, help="Name of the voice to use")
+    parser_quant.add_argument("--text", type=str, default="The quick brown fox jumps over the lazy dog. How vexingly quick daft zebras jump!",
+                              help="Text to render in both modes")
+    parser_quant.add_argument("--lang", type=str, default="en", help="Language code")
+    parser_quant.add_argument("--seed", type=int, default=0, help="Seed used for both renders")
+    parser_quant.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    parser_quant.add_argument("--interop-threads", type=int, default=None, help="torch inter-op threads")
+    parser_quant.add_argument("--out-dir", type=str, default="quantize_report", help="Where to write both renders and report.json")
+
+    # Command: BENCH
+    parser_bench = subparsers.add_parser("bench", help="Benchmark startup, refine, model load, conditioning and synthesis",
+                                         parents=[engine_args])
+    parser_bench.add_argument("--stub", action="store_true", help="Use the deterministic stub model (no weights or network needed)")
+    parser_bench.add_argument("--model", type=str, default=None, help="Backend/model to benchmark, as a voice's base_model (default xtts_v2)")
+    parser_bench.add_argument("--stages", type=str, default="startup,refine,model", help="Comma-separated stages to run")
+    parser_bench.add_argument("--lengths", type=str, default="50,200,800", help="Text lengths (characters) for synthesis RTF")
+    parser_bench.add_argument("--clips", type=str, default="1,4,16", help="Clip counts for the refine benchmark")
+    parser_bench.add_argument("--runs", type=int, default=3, help="Repetitions per measurement (median is reported)")
+    parser_bench.add_argument("--voice", type=str, default=None, help="Condition on this voice's reference instead of a synthetic clip")
+    parser_bench.add_argument("--out", type=str, default="bench.json", help="Where to write the results")
+    parser_bench.add_argument("--baseline", type=str, default=None, help="Compare against this saved results file")
+    parser_bench.add_argument("--tolerance", type=float, default=0.10, help="Relative slowdown that counts as a regression")
+
+    # Command: CACHE
+    parser_cache = subparsers.add_parser("cache", help="Show synthesis cache statistics", parents=[cache_args])
+    parser_cache.add_argument("--clear", action="store_true", help="Remove all cached outputs")
 
     args = parser.parse_args()
-    
+
+    sinks = []
+    if args.trace or args.trace_file or args.metrics_out:
+        from src import tracing
+
+        if args.trace:
+            sinks.append(tracing.add_sink(tracing.JsonLogSink()))
+        if args.trace_file:
+            sinks.append(tracing.add_sink(tracing.JsonLogSink(path=args.trace_file)))
+        if args.metrics_out:
+            sinks.append(tracing.add_sink(tracing.HistogramRegistry()))
+    if args.model_budget is not None:
+        from src.models import MODELS
+        MODELS.budget_mb = args.model_budget
+    try:
+        run_command(parser, args)
+    finally:
+        for sink in sinks:
+            if hasattr(sink, "to_prometheus"):
+                with open(args.metrics_out, 'w') as f:
+                    f.write(sink.to_prometheus())
+            elif hasattr(sink, "close"):
+                sink.close()
+
+def speak_command(args, manager: VoiceManager, to_stdout: bool):
+    """speak: through a running server when there is one, otherwise in-process."""
+    from src.encode import check_format, format_for_path
+    from src.server import SynthesisClient, ServerError
+
+    fmt = args.format or format_for_path(args.out)
+    try:
+        check_format(fmt)
+    except (RuntimeError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+    if args.stream and fmt not in ("wav", "pcm"):
+        print(f"❌ --stream writes WAV, or raw PCM to stdout; {fmt} needs the whole utterance first")
+        return
+
+    if not args.local and not args.stream:
+        client = SynthesisClient(args.server)
+        if client.is_available():
+            try:
+                if to_stdout:
+                    audio = client.speak_bytes(args.voice, args.text, format=fmt, language=args.lang,
+                                               seed=args.seed, timeout=args.timeout)
+                    sys.__stdout__.buffer.write(audio)
+                    sys.__stdout__.buffer.flush()
+                elif not client.can_write(args.out):
+                    # Outside the server's output directory: receive the audio and write it here
+                    audio = client.speak_bytes(args.voice, args.text, format=fmt, language=args.lang,
+                                               seed=args.seed, timeout=args.timeout)
+                    with open(args.out, "wb") as f:
+                        f.write(audio)
+                    print(f"✓ Generated audio: {args.out}")
+                else:
+                    output = client.speak(args.voice, args.text, args.out, language=args.lang,
+                                          seed=args.seed, timeout=args.timeout, format=args.format)
+                    print(f"✓ Generated audio: {output}")
+            except ServerError as e:
+                print(f"❌ Server error: {e}")
+            return
+
+    # Check if voice exists and has audio
+    ref_audio = manager.get_reference_audio(args.voice)
+    if not ref_audio:
+        print(f"❌ Error: Voice '{args.voice}' has no reference audio!")
+        print(f"   Please record audio for this voice first (feature coming soon).")
+        print(f"   Or manually add .wav files to voices/{manager._sanitize_name(args.voice)}/audio/")
+        return
+
+    synthesizer = make_synthesizer(args, manager).using(manager.get_base_model(args.voice))
+
+    if args.stream:
+        from src.synthesis import write_wav_stream
+
+        latents = manager.get_conditioning_latents(args.voice, synthesizer)
+        chunks = synthesizer.speak_stream(
+            text=args.text,
+            reference_audio_path=ref_audio,
+            language=args.lang,
+            latents=latents
+        )
+        if to_stdout:
+            for chunk in chunks:
+                sys.__stdout__.buffer.write(chunk.tobytes())
+                sys.__stdout__.buffer.flush()
+        else:
+            write_wav_stream(chunks, args.out, synthesizer.sample_rate)
+            print(f"✓ Generated audio: {args.out}")
+
+        stats = synthesizer.stream_stats
+        print(f"⏱️  First chunk after {stats['time_to_first_chunk']:.2f}s, "
+              f"{stats['audio_seconds']:.1f}s of audio in {stats['total_time']:.2f}s")
+        return
+
+    latents = None
+    ref_hash = manager.get_reference_hash(args.voice)
+    if to_stdout or not synthesizer.is_cached(args.text, ref_audio, args.lang, args.seed, fmt, ref_hash):
+        latents = manager.get_conditioning_latents(args.voice, synthesizer)
+    output = synthesizer.speak(
+        text=args.text, 
+        output_path=args.out, 
+        reference_audio_path=ref_audio, 
+        language=args.lang,
+        latents=latents,
+        seed=args.seed,
+        format=fmt,
+        reference_hash=ref_hash
+    )
+    if not to_stdout:
+        print(f"✓ Generated audio: {output}")
+
+
+def run_command(parser: argparse.ArgumentParser, args: argparse.Namespace):
     manager = VoiceManager()
     
     if args.command == "new":
@@ -47,44 +288,257 @@ def main():
             print(f"Error: Voice '{args.voice}' does not exist. Create it first.")
             return
             
+        from src.recorder import AudioRecorder
+
         output_path = manager.create_new_recording_path(args.voice)
         recorder = AudioRecorder()
-        if recorder.record(args.duration, output_path):
+        if recorder.record(args.duration, output_path, stop_on_silence=args.auto_stop, trim=not args.no_trim):
             # Auto-refine after recording
             manager.process_audio(args.voice)
             
     elif args.command == "refine":
-        manager.process_audio(args.voice)
+        manager.process_audio(args.voice, max_reference_seconds=args.max_seconds)
         
+    elif args.command == "ingest":
+        import json
+        from src.ingest import Ingester, load_sources
+
+        try:
+            speakers = load_sources(args.source)
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not read {args.source}: {e}")
+            return
+        if not speakers:
+            print(f"No audio found in {args.source}")
+            return
+        print(f"⏳ Ingesting {sum(len(s['files']) for s in speakers.values())} files for {len(speakers)} voices...")
+        summary = Ingester(manager, workers=args.workers, max_reference_seconds=args.max_seconds).run(speakers)
+        print(f"\n✓ {summary['voices']} voices ({summary['created']} new) in {summary['seconds']:.1f}s: "
+              f"{summary['added']} clips added, {summary['kept']} already present, {summary['rejected']} rejected")
+        if summary["failed"]:
+            print(f"❌ Failed: {', '.join(summary['failed'])}")
+        if args.report:
+            with open(args.report, 'w') as f:
+                json.dump(summary, f, indent=4)
+
+    elif args.command == "similar":
+        import os
+        from src.synthesis import Synthesizer
+
+        is_clip = os.path.isfile(args.query)
+        if not is_clip and not manager.get_voice_path(args.query):
+            print(f"❌ '{args.query}' is neither a voice nor an audio file")
+            return
+        base_model = args.model or (None if is_clip else manager.get_base_model(args.query))
+        synthesizer = Synthesizer(base_model, quantize=args.quantize, threads=args.threads,
+                                  interop_threads=args.interop_threads, device=args.device)
+        if not synthesizer.capabilities.cloning:
+            print(f"❌ {synthesizer.model_id} has no speaker embeddings to compare")
+            return
+        if not args.no_update:
+            updated = manager.update_similarity_index(synthesizer)
+            if updated:
+                print(f"✓ Indexed {updated} new or changed voices")
+        try:
+            matches = manager.find_similar(args.query, synthesizer, k=args.top)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        if not matches:
+            print("No other voices indexed yet.")
+            return
+        print(f"\nVoices most similar to {args.query} ({synthesizer.model_id}):")
+        print(f"{'Similarity':>10}  {'Name':<20} {'ID'}")
+        for m in matches:
+            print(f"{m['similarity']:>10.3f}  {m['name']:<20} {m['id']}")
+
     elif args.command == "list":
-        voices = manager.list_voices()
+        voices = manager.list_voices(limit=args.limit, offset=args.offset, query=args.filter)
         if not voices:
-            print("No voices found. Create one with 'new <name>'")
+            if args.filter or args.offset:
+                print("No matching voices.")
+            else:
+                print("No voices found. Create one with 'new <name>'")
         else:
+            total = manager.count_voices(args.filter)
             print("\nAvailable Voices:")
-            print(f"{'Name':<20} {'ID':<20} {'Description'}")
-            print("-" * 60)
+            print(f"{'Name':<20} {'ID':<20} {'Clips':>5}  {'Description'}")
+            print("-" * 70)
             for v in voices:
-                print(f"{v['name']:<20} {v['id']:<20} {v['description']}")
-            print("-" * 60)
+                print(f"{v['name']:<20} {v['id']:<20} {v['clip_count']:>5}  {v['description']}")
+            print("-" * 70)
+            if len(voices) < total:
+                print(f"Showing {args.offset + 1}-{args.offset + len(voices)} of {total}")
+
+    elif args.command == "reindex":
+        count = manager.rebuild_registry()
+        print(f"✓ Registry rebuilt: {count} voices indexed")
             
     elif args.command == "speak":
-        # Check if voice exists and has audio
+        # With '--out -' the audio goes to stdout, so keep status messages on stderr
+        to_stdout = args.out == "-"
+        with contextlib.redirect_stdout(sys.stderr) if to_stdout else contextlib.nullcontext():
+            speak_command(args, manager, to_stdout)
+
+    elif args.command == "speak-long":
+        import json
+        from src.longform import LongFormRenderer, read_document
+
         ref_audio = manager.get_reference_audio(args.voice)
         if not ref_audio:
             print(f"❌ Error: Voice '{args.voice}' has no reference audio!")
-            print(f"   Please record audio for this voice first (feature coming soon).")
-            print(f"   Or manually add .wav files to voices/{manager._sanitize_name(args.voice)}/audio/")
+            return
+        is_file = Path(args.source).suffix.lower() in (".txt", ".md", ".markdown") and Path(args.source).is_file()
+        text = read_document(args.source) if is_file else args.source
+
+        from src.synthesis import Synthesizer
+
+        synthesizer = Synthesizer(manager.get_base_model(args.voice), quantize=args.quantize,
+                                  threads=args.threads, interop_threads=args.interop_threads, device=args.device)
+        latents = manager.get_conditioning_latents(args.voice, synthesizer)
+        renderer = LongFormRenderer(synthesizer, crossfade_ms=args.crossfade_ms, max_chars=args.max_chars)
+        try:
+            report = renderer.speak(text, args.out, reference_audio_path=ref_audio, language=args.lang,
+                                    latents=latents, seed=args.seed, format=args.format)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+
+        print(f"\n{'#':>4} {'Chars':>5} {'Audio':>7} {'Infer':>7}  Text")
+        for c in report["chunks"]:
+            infer = "reused" if c["reused"] else f"{c['inference_seconds']:.2f}s"
+            print(f"{c['position'] + 1:>4} {c['chars']:>5} {c['audio_seconds']:>6.1f}s {infer:>7}  {c['text']}")
+        print(f"✓ Generated audio: {args.out} ({report['audio_seconds']:.1f}s from {report['total_chunks']} chunks, "
+              f"{report['unique_chunks']} rendered, RTF {report['real_time_factor']:.2f})")
+        if args.report:
+            with open(args.report, 'w') as f:
+                json.dump(report, f, indent=4)
+
+    elif args.command == "speak-batch":
+        from src.batch import BatchRunner, load_manifest
+
+        try:
+            jobs = load_manifest(args.manifest)
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not read manifest: {e}")
             return
 
-        synthesizer = Synthesizer()
-        output = synthesizer.speak(
-            text=args.text, 
-            output_path=args.out, 
-            reference_audio_path=ref_audio, 
-            language=args.lang
+        progress = args.progress or f"{args.manifest}.progress.jsonl"
+        synthesizer = make_synthesizer(args, manager)
+        pool = None
+        if args.workers > 1:
+            from src.pool import WorkerPool
+            pool = WorkerPool(manager, synthesizer, workers=args.workers, threads_per_worker=args.threads_per_worker)
+        runner = BatchRunner(manager, synthesizer, progress_path=progress, seed=args.seed, pool=pool)
+        try:
+            summary = runner.run(jobs)
+        finally:
+            if pool:
+                pool.shutdown()
+
+        print("\nBatch Summary:")
+        print(f"  Jobs:       {summary['done']} done, {summary['skipped']} already done, {summary['failed']} failed (of {summary['total']})")
+        print(f"  Model load: {summary['load_seconds']:.1f}s")
+        print(f"  Audio:      {summary['audio_seconds']:.1f}s in {summary['synthesis_seconds']:.1f}s")
+        print(f"  Throughput: {summary['chars_per_second']:.1f} chars/sec, RTF {summary['real_time_factor']:.2f}")
+        print(f"  Wall clock: {summary['wall_seconds']:.1f}s ({summary['audio_per_wall_second']:.2f}s of audio per second)")
+        if summary.get("workers"):
+            parent = summary["parent_memory"]
+            if parent:
+                print(f"  Parent:     {parent['rss_mb']:.0f} MB RSS after model load")
+            print(f"  {'Worker':<8} {'Jobs':>5} {'Audio':>8} {'Busy':>8} {'RSS':>8} {'PSS':>8} {'Private':>8}")
+            for index, w in sorted(summary["workers"].items()):
+                mem = w["memory"] or {"rss_mb": 0.0, "pss_mb": 0.0, "private_mb": 0.0}
+                print(f"  {index:<8} {w['jobs']:>5} {w['audio_seconds']:>7.1f}s {w['busy_seconds']:>7.1f}s "
+                      f"{mem['rss_mb']:>5.0f} MB {mem['pss_mb']:>5.0f} MB {mem['private_mb']:>5.0f} MB")
+
+    elif args.command == "serve":
+        from src.server import SynthesisServer
+
+        server = SynthesisServer(
+            manager,
+            make_synthesizer(args, manager),
+            host=args.host,
+            port=args.port,
+            max_queue=args.queue_size,
+            timeout=args.timeout,
+            output_dir=args.output_dir
         )
-        print(f"✓ Generated audio: {output}")
+        server.serve_forever()
+
+    elif args.command == "quantize-report":
+        from src.quantize import compare
+
+        if not manager.get_reference_audio(args.voice):
+            print(f"❌ Error: Voice '{args.voice}' has no reference audio!")
+            return
+        report = compare(args.voice, args.text, language=args.lang, seed=args.seed, out_dir=args.out_dir,
+                         threads=args.threads, interop_threads=args.interop_threads)
+        print(f"\nQuantisation Report ({len(args.text)} chars):")
+        print(f"{'':<8} {'Load':>8} {'Synth':>8} {'RTF':>6} {'Peak RSS':>10}")
+        for name in ("fp32", "int8"):
+            r = report[name]
+            print(f"{name:<8} {r['load_seconds']:>7.1f}s {r['synthesis_seconds']:>7.1f}s "
+                  f"{r['real_time_factor']:>6.2f} {r['peak_rss_mb']:>7.0f} MB")
+        sim = report["similarity"]
+        speedup = report["fp32"]["synthesis_seconds"] / max(report["int8"]["synthesis_seconds"], 1e-9)
+        print(f"Speed-up: {speedup:.2f}x  Spectral similarity: {sim['spectral_cosine']:.3f}  "
+              f"Duration ratio: {sim['duration_ratio']:.2f}")
+        print(f"✓ Report written to {Path(args.out_dir) / 'report.json'}")
+
+    elif args.command == "bench":
+        from src import bench
+
+        from src.synthesis import Synthesizer
+
+        # No output cache: repeated renders must actually synthesize
+        synthesizer = Synthesizer("stub" if args.stub else args.model, quantize=args.quantize,
+                                  threads=args.threads, interop_threads=args.interop_threads, device=args.device)
+        reference = None
+        if args.voice:
+            reference = manager.get_reference_audio(args.voice)
+            if not reference:
+                print(f"❌ Error: Voice '{args.voice}' has no reference audio!")
+                return
+
+        results = bench.run_suite(
+            synthesizer,
+            stages=[s.strip() for s in args.stages.split(",") if s.strip()],
+            lengths=[int(n) for n in args.lengths.split(",")],
+            clip_counts=[int(n) for n in args.clips.split(",")],
+            reference=reference,
+            runs=args.runs
+        )
+        bench.save(results, args.out)
+
+        print(f"\nBenchmark ({results['meta']['model']}):")
+        for name, value in results["metrics"].items():
+            print(f"  {name:<36} {value * 1000:>10.1f} ms" if not name.endswith(".rtf") else f"  {name:<36} {value:>10.3f}")
+        print(f"✓ Results written to {args.out}")
+
+        if args.baseline:
+            rows = bench.compare(results, bench.load(args.baseline), tolerance=args.tolerance)
+            regressions = [r for r in rows if r["regression"]]
+            print(f"\nCompared with {args.baseline}:")
+            for r in rows:
+                flag = "  ❌ REGRESSION" if r["regression"] else ""
+                print(f"  {r['metric']:<36} {r['change']:>+8.1%}{flag}")
+            if regressions:
+                print(f"❌ {len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+                sys.exit(1)
+            print("✓ No regressions")
+
+    elif args.command == "cache":
+        cache = SynthesisCache(args.cache_dir or manager.base_dir / ".cache", max_bytes=args.cache_size * 1024 * 1024)
+        if args.clear:
+            cache.clear()
+            print(f"✓ Cleared synthesis cache at {cache.cache_dir}")
+            return
+        stats = cache.stats()
+        print(f"\nSynthesis Cache ({cache.cache_dir}):")
+        print(f"  Entries:  {stats['entries']} ({stats['bytes'] / 1e6:.1f} MB of {stats['max_bytes'] / 1e6:.0f} MB)")
+        print(f"  Hits:     {stats['hits']}  Misses: {stats['misses']}  Hit rate: {stats['hit_rate']:.1%}")
+        print(f"  Evicted:  {stats['evictions']}")
 
     else:
         parser.print_help()
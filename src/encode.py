@@ -0,0 +1,104 @@
+import io
+import sys
+import wave
+import numpy as np
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+
+FORMATS = ("wav", "flac", "opus", "pcm")
+EXTENSIONS = {".wav": "wav", ".flac": "flac", ".opus": "opus", ".ogg": "opus", ".pcm": "pcm", ".raw": "pcm"}
+MIME_TYPES = {"wav": "audio/wav", "flac": "audio/flac", "opus": "audio/ogg", "pcm": "audio/L16"}
+OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+def format_for_path(path: str, default: str = "wav") -> str:
+    """Output format implied by a file name's extension ('-' for stdout means raw PCM)."""
+    if path == "-":
+        return "pcm"
+    return EXTENSIONS.get(Path(path).suffix.lower(), default)
+
+
+def to_pcm16(audio: np.ndarray) -> np.ndarray:
+    return (np.clip(np.asarray(audio, dtype=np.float32), -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def _soundfile():
+    try:
+        import soundfile
+    except ImportError:
+        raise RuntimeError("FLAC/Opus support needs the 'soundfile' package: pip install soundfile")
+    return soundfile
+
+
+def check_format(fmt: str):
+    """Fail early, before any synthesis, if `fmt` is unknown or its encoder isn't installed."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown audio format '{fmt}' (expected one of {', '.join(FORMATS)})")
+    if fmt in ("flac", "opus"):
+        _soundfile()
+
+
+def encode_to(stream: BinaryIO, audio: np.ndarray, sample_rate: int, fmt: str = "wav"):
+    """Encode mono float32 audio into an open binary stream."""
+    if fmt == "pcm":
+        # Raw 16-bit little-endian mono, as '--stream --out -' writes
+        stream.write(to_pcm16(audio).astype("<i2").tobytes())
+    elif fmt == "wav":
+        with wave.open(stream, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(to_pcm16(audio).tobytes())
+    elif fmt == "flac":
+        _soundfile().write(stream, to_pcm16(audio), sample_rate, format="FLAC", subtype="PCM_16")
+    elif fmt == "opus":
+        if sample_rate not in OPUS_RATES:
+            from src.audio import resample
+            audio, sample_rate = resample(np.asarray(audio, dtype=np.float32), sample_rate, 48000), 48000
+        _soundfile().write(stream, np.asarray(audio, dtype=np.float32), sample_rate, format="OGG", subtype="OPUS")
+    else:
+        raise ValueError(f"Unknown audio format '{fmt}' (expected one of {', '.join(FORMATS)})")
+
+
+def encode(audio: np.ndarray, sample_rate: int, fmt: str = "wav") -> bytes:
+    """Encode mono float32 audio to bytes in memory."""
+    buffer = io.BytesIO()
+    encode_to(buffer, audio, sample_rate, fmt)
+    return buffer.getvalue()
+
+
+def write(audio: np.ndarray, sample_rate: int, path: str, fmt: Optional[str] = None) -> str:
+    """Encode audio to a file, or to stdout when path is '-'. The format defaults to the extension's."""
+    fmt = fmt or format_for_path(path)
+    if path == "-":
+        # The real stdout, even while prints are redirected to stderr to keep it clean
+        encode_to(sys.__stdout__.buffer, audio, sample_rate, fmt)
+        sys.__stdout__.buffer.flush()
+        return path
+    with open(path, "wb") as f:
+        encode_to(f, audio, sample_rate, fmt)
+    return path
+
+
+def decode(path: str) -> Tuple[int, np.ndarray]:
+    """
+    Read an audio file as (sample_rate, samples). WAV keeps its native PCM dtype and
+    channel layout (as scipy reads it); other formats come back as float32.
+    """
+    if format_for_path(path) == "wav":
+        from scipy.io import wavfile
+        return wavfile.read(path)
+    audio, sample_rate = _soundfile().read(path, dtype="float32")
+    return sample_rate, audio
+
+
+def duration(path: str) -> float:
+    """Duration of an encoded file in seconds (0.0 if it cannot be read)."""
+    try:
+        if format_for_path(path) == "wav":
+            with wave.open(path, "rb") as wav:
+                return wav.getnframes() / float(wav.getframerate())
+        info = _soundfile().info(path)
+        return info.frames / float(info.samplerate)
+    except (wave.Error, OSError, EOFError, RuntimeError):
+        return 0.0
@@ -0,0 +1,228 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.utils import file_hash
+
+# Source formats ingest can decode (non-WAV through soundfile, see src.encode)
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg", ".opus")
+MIN_CLIP_SECONDS = 1.0      # Shorter clips carry too little of the voice to be worth keeping
+MIN_SNR_DB = 5.0            # Below this the noise is as loud as the speaker
+MAX_CLIPPING = 0.01         # Fraction of clipped samples beyond which a clip is rejected
+REPORT_NAME = "ingest.json"
+
+
+def load_sources(source: str) -> Dict[str, Dict]:
+    """
+    Map speakers to the audio files that belong to them.
+
+    `source` is either a directory with one sub-directory per speaker (searched
+    recursively for audio files), or a JSONL/CSV manifest whose rows name a
+    'speaker' (or 'voice') and a 'path' (or 'file'), relative to the manifest,
+    and may add a 'description'. Returns {speaker: {"files": [...], "description": str}}.
+    """
+    root = Path(source).resolve()  # Reports key sources by absolute path, whatever the working directory
+    speakers: Dict[str, Dict] = {}
+    if root.is_dir():
+        for speaker_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+            files = sorted(str(p) for p in speaker_dir.rglob("*")
+                           if p.suffix.lower() in AUDIO_EXTENSIONS and p.is_file())
+            if files:
+                speakers[speaker_dir.name] = {"files": files, "description": ""}
+        return speakers
+
+    if root.suffix.lower() == ".csv":
+        with open(root, newline='', encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(root, 'r', encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    for number, row in enumerate(rows, 1):
+        speaker = row.get("speaker") or row.get("voice")
+        path = row.get("path") or row.get("file")
+        if not speaker or not path:
+            raise ValueError(f"{source} row {number}: needs 'speaker' and 'path'")
+        entry = speakers.setdefault(speaker, {"files": [], "description": ""})
+        entry["files"].append(str((root.parent / path).resolve()))
+        entry["description"] = entry["description"] or row.get("description") or ""
+    return speakers
+
+
+def _signature(path: str) -> Dict:
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime": st.st_mtime}
+
+
+def prepare_clip(source: str, audio_dir: Path, digest: str) -> Dict:
+    """
+    Decode, validate and trim one source file into the voice's audio directory.
+    The clip is named by the source's content hash, so the same recording is
+    stored once however often (or under whatever name) it is ingested.
+    """
+    from scipy.io import wavfile
+    from src import encode, vad
+
+    name = f"clip_{digest[:16]}.wav"
+    if (audio_dir / name).exists():
+        return {"status": "exists", "clip": name}
+    try:
+        sample_rate, audio = encode.decode(source)
+    except Exception as e:
+        return {"status": "rejected", "reason": f"unreadable: {e}"}
+
+    duration = len(audio) / float(sample_rate) if sample_rate else 0.0
+    if duration < MIN_CLIP_SECONDS:
+        return {"status": "rejected", "reason": f"too short ({duration:.2f}s)"}
+    analysis = vad.analyse(audio, sample_rate)
+    if not analysis["segments"]:
+        return {"status": "rejected", "reason": "no speech detected"}
+    if analysis["speech_seconds"] < MIN_CLIP_SECONDS:
+        return {"status": "rejected", "reason": f"too little speech ({analysis['speech_seconds']:.2f}s)"}
+    if analysis["snr_db"] < MIN_SNR_DB:
+        return {"status": "rejected", "reason": f"too noisy (SNR {analysis['snr_db']:.1f} dB)"}
+    if analysis["clipping"] > MAX_CLIPPING:
+        return {"status": "rejected", "reason": f"clipped ({analysis['clipping']:.1%} of samples)"}
+
+    # Trim only the leading/trailing silence; refine shortens interior pauses itself
+    start, end = analysis["segments"][0][0], analysis["segments"][-1][1]
+    tmp_path = audio_dir / f"{name}.{os.getpid()}.tmp"
+    wavfile.write(tmp_path, sample_rate, audio[start:end])
+    os.replace(tmp_path, audio_dir / name)
+    return {"status": "added", "clip": name, "seconds": round((end - start) / float(sample_rate), 2),
+            "snr_db": round(analysis["snr_db"], 1)}
+
+
+def ingest_voice(base_dir: str, voice_name: str, files: List[str],
+                 max_reference_seconds: Optional[float] = None) -> Dict:
+    """
+    Bring one speaker's files into their profile and refine it; runs in a pool worker.
+
+    Sources already seen with the same size and mtime are taken from the previous
+    report without being read, and refinement is skipped when no clip was added,
+    so a rerun over an unchanged corpus does almost nothing. The report is
+    written to processed/ingest.json.
+    """
+    from src.manager import VoiceManager
+
+    start = time.perf_counter()
+    # One process per voice already keeps every core busy, so refine runs inline
+    manager = VoiceManager(base_dir, max_workers=1)
+    voice_id = manager._sanitize_name(voice_name)
+    voice_dir = manager.base_dir / voice_id
+    report_path = voice_dir / "processed" / REPORT_NAME
+    previous = {}
+    if report_path.exists():
+        try:
+            with open(report_path, 'r') as f:
+                previous = json.load(f).get("sources", {})
+        except (OSError, ValueError):
+            pass
+
+    sources = {}
+    for path in files:
+        try:
+            signature = _signature(path)
+        except OSError as e:
+            sources[path] = {"status": "rejected", "reason": f"unreadable: {e}"}
+            continue
+        known = previous.get(path)
+        if known and all(known.get(k) == v for k, v in signature.items()):
+            if known["status"] == "rejected":
+                sources[path] = known
+                continue
+            if (voice_dir / "audio" / known["clip"]).exists():
+                sources[path] = dict(known, status="unchanged")
+                continue
+        digest = file_hash(path)
+        entry = prepare_clip(path, voice_dir / "audio", digest)
+        sources[path] = dict(entry, hash=digest, **signature)
+
+    added = sum(1 for s in sources.values() if s["status"] == "added")
+    usable = any((voice_dir / "audio").glob("*.wav"))
+    log = io.StringIO()
+    refined = None
+    if usable and (added or manager._find_reference(voice_dir) is None):
+        # Keep refine's per-clip output for the report instead of interleaving workers on the terminal
+        with contextlib.redirect_stdout(log):
+            refined = manager.process_audio(voice_name, max_reference_seconds=max_reference_seconds)
+
+    reference = manager._load_metadata(voice_id).get("reference", {})
+    report = {
+        "voice": voice_name,
+        "id": voice_id,
+        "sources": sources,
+        "added": added,
+        "kept": sum(1 for s in sources.values() if s["status"] in ("unchanged", "exists")),
+        "rejected": sum(1 for s in sources.values() if s["status"] == "rejected"),
+        "refined": refined,
+        "reference_clips": len(reference.get("clips", [])),
+        "reference_seconds": reference.get("speech_seconds", 0.0),
+        "seconds": round(time.perf_counter() - start, 2),
+        "refine_log": log.getvalue().splitlines(),
+    }
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=4)
+    return report
+
+
+class Ingester:
+    """
+    Onboards many speakers at once: creates missing profiles, then decodes,
+    validates, trims and refines each speaker's clips in a process pool, one
+    voice per task. Profiles are created up front in this process so pool
+    workers never race to create the same directory or registry row.
+    """
+
+    def __init__(self, manager, workers: Optional[int] = None, max_reference_seconds: Optional[float] = None):
+        self.manager = manager
+        self.workers = workers or os.cpu_count() or 1
+        self.max_reference_seconds = max_reference_seconds
+
+    def run(self, speakers: Dict[str, Dict]) -> Dict:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        start = time.perf_counter()
+        created = 0
+        for name, entry in speakers.items():
+            if not self.manager.get_voice_path(name):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    created += self.manager.create_voice(name, entry["description"])
+
+        summary = {"voices": len(speakers), "created": created, "added": 0, "kept": 0, "rejected": 0,
+                   "failed": [], "reports": {}}
+        with ProcessPoolExecutor(max_workers=min(self.workers, max(1, len(speakers)))) as pool:
+            futures = {
+                pool.submit(ingest_voice, str(self.manager.base_dir), name, entry["files"],
+                            self.max_reference_seconds): name
+                for name, entry in speakers.items()
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                name = futures[future]
+                try:
+                    report = future.result()
+                except Exception as e:
+                    summary["failed"].append(name)
+                    print(f"[{done}/{len(futures)}] ❌ {name}: {e}")
+                    continue
+                for key in ("added", "kept", "rejected"):
+                    summary[key] += report[key]
+                if report["refined"] is False:
+                    summary["failed"].append(name)
+                summary["reports"][name] = str(self.manager.base_dir / report["id"] / "processed" / REPORT_NAME)
+                if report["refined"] is False:
+                    status = "❌ refine failed"
+                elif not report["reference_clips"]:
+                    status = "⚠️ no usable clips"
+                else:
+                    status = "✓"
+                print(f"[{done}/{len(futures)}] {status} {name}: {report['added']} added, {report['kept']} kept, "
+                      f"{report['rejected']} rejected, reference {report['reference_seconds']:.1f}s "
+                      f"({report['seconds']:.1f}s)")
+
+        summary["seconds"] = round(time.perf_counter() - start, 2)
+        return summary
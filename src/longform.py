@@ -0,0 +1,276 @@
+import queue
+import re
+import threading
+import time
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from src import encode, tracing
+
+# Per-segment character limits of the XTTS tokenizer; longer input gets truncated or garbled
+CHAR_LIMITS = {
+    "en": 250, "de": 253, "fr": 273, "es": 239, "it": 213, "pt": 203, "pl": 224, "zh-cn": 82, "ar": 166,
+    "cs": 186, "ru": 182, "nl": 251, "tr": 226, "ja": 71, "hu": 224, "ko": 95, "hi": 150,
+}
+DEFAULT_CHAR_LIMIT = 200
+
+# Sentence-final punctuation; CJK and Devanagari end sentences without a following space
+_LATIN_END = re.compile(r'(?<=[.!?…])\s+|(?<=[.!?…]["”’)\]])\s+')
+_CJK_END = re.compile(r'(?<=[。！？；])')
+_DEVANAGARI_END = re.compile(r'(?<=[।॥?!])\s*')
+_ARABIC_END = re.compile(r'(?<=[.!؟…])\s+')
+_CLAUSE = re.compile(r'(?<=[,;:，、；：])\s*')
+_SPACE = re.compile(r'\s+')
+# Abbreviations whose period doesn't end a sentence (English; the common case)
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e", "no", "fig", "approx"}
+
+PARAGRAPH_PAUSE = 0.4   # Seconds of silence between paragraphs
+CROSSFADE_MS = 20
+
+
+def read_document(path: str) -> str:
+    """Read a .txt or .md file; Markdown is reduced to the text that should be spoken."""
+    text = Path(path).read_text(encoding="utf-8")
+    if Path(path).suffix.lower() in (".md", ".markdown"):
+        text = strip_markdown(text)
+    return text
+
+
+def strip_markdown(text: str) -> str:
+    text = re.sub(r"```.*?```", "", text, flags=re.S)              # Code blocks
+    text = re.sub(r"!\[[^\]]*\]\([^)]*\)", "", text)                # Images
+    text = re.sub(r"\[([^\]]+)\]\([^)]*\)", r"\1", text)            # Links -> link text
+    text = re.sub(r"`([^`]*)`", r"\1", text)                        # Inline code
+    text = re.sub(r"^\s{0,3}#{1,6}\s*(.*?)\s*#*\s*$", r"\1.", text, flags=re.M)  # Headings read as sentences
+    text = re.sub(r"^\s*([-*+]|\d+[.)])\s+", "", text, flags=re.M)  # List markers
+    text = re.sub(r"^\s*>\s?", "", text, flags=re.M)                # Block quotes
+    text = re.sub(r"^\s*([-*_]\s*){3,}$", "", text, flags=re.M)     # Horizontal rules
+    text = re.sub(r"(\*\*|__|\*|_|~~)(\S.*?\S|\S)\1", r"\2", text)  # Emphasis
+    text = re.sub(r"<[^>]+>", "", text)                             # Inline HTML
+    return text
+
+
+def _sentence_pattern(language: str) -> re.Pattern:
+    if language in ("zh-cn", "zh", "ja", "ko"):
+        return _CJK_END
+    if language == "hi":
+        return _DEVANAGARI_END
+    if language == "ar":
+        return _ARABIC_END
+    return _LATIN_END
+
+
+def _split_sentences(paragraph: str, language: str) -> List[str]:
+    pieces = [p.strip() for p in _sentence_pattern(language).split(paragraph) if p and p.strip()]
+    if language != "en":
+        return pieces
+    # Re-join splits that fell after an abbreviation ("Dr. Smith")
+    sentences: List[str] = []
+    for piece in pieces:
+        if sentences:
+            last_word = sentences[-1].rsplit(None, 1)[-1].rstrip(".").lower()
+            if last_word in _ABBREVIATIONS:
+                sentences[-1] += " " + piece
+                continue
+        sentences.append(piece)
+    return sentences
+
+
+def _fit(sentence: str, limit: int, joiner: str = " ") -> List[str]:
+    """Break an over-long sentence at clause punctuation, then at spaces, then anywhere."""
+    if len(sentence) <= limit:
+        return [sentence]
+    for pattern in (_CLAUSE, _SPACE):
+        parts = [p.strip() for p in pattern.split(sentence) if p.strip()]
+        if len(parts) > 1:
+            break
+    else:
+        return [sentence[i:i + limit] for i in range(0, len(sentence), limit)]
+    chunks: List[str] = []
+    for part in parts:
+        for piece in _fit(part, limit, joiner):
+            if chunks and len(chunks[-1]) + len(joiner) + len(piece) <= limit:
+                chunks[-1] += joiner + piece
+            else:
+                chunks.append(piece)
+    return chunks
+
+
+def segment(text: str, language: str = "en", max_chars: Optional[int] = None) -> List[Tuple[str, bool]]:
+    """
+    Split a document into (chunk, ends_paragraph) pairs.
+    Each chunk is one sentence; sentences over the language's character limit are
+    broken at clauses or words. Sentence-sized chunks keep prosody natural and
+    let repeated sentences be rendered once.
+    """
+    limit = max_chars or CHAR_LIMITS.get(language, DEFAULT_CHAR_LIMIT)
+    joiner = "" if language in ("zh-cn", "zh", "ja") else " "
+    chunks = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        pieces = [piece for sentence in _split_sentences(paragraph, language) for piece in _fit(sentence, limit, joiner)]
+        chunks.extend((piece, i == len(pieces) - 1) for i, piece in enumerate(pieces))
+    return chunks
+
+
+class OutputBuffer:
+    """
+    Preallocated float32 output that chunks are crossfaded into.
+    Sized from an estimate up front and grown geometrically if the estimate was short,
+    so stitching never re-concatenates the whole document.
+    """
+
+    def __init__(self, estimated_samples: int, fade: int):
+        self.data = np.zeros(max(estimated_samples, 1), dtype=np.float32)
+        self.length = 0
+        self.fade = fade
+
+    def _reserve(self, samples: int):
+        if self.length + samples > len(self.data):
+            grown = np.zeros(max(len(self.data) * 2, self.length + samples), dtype=np.float32)
+            grown[:self.length] = self.data[:self.length]
+            self.data = grown
+
+    def append(self, audio: np.ndarray, crossfade: bool = True):
+        audio = np.asarray(audio, dtype=np.float32)
+        overlap = min(self.fade, self.length, len(audio)) if crossfade else 0
+        if overlap:
+            ramp = np.linspace(0.0, 1.0, overlap, dtype=np.float32)
+            tail = self.data[self.length - overlap:self.length]
+            tail *= 1.0 - ramp
+            tail += audio[:overlap] * ramp
+        rest = audio[overlap:]
+        self._reserve(len(rest))
+        self.data[self.length:self.length + len(rest)] = rest
+        self.length += len(rest)
+
+    def silence(self, samples: int):
+        self._reserve(samples)
+        self.data[self.length:self.length + samples] = 0.0
+        self.length += samples
+
+    def audio(self) -> np.ndarray:
+        return self.data[:self.length]
+
+
+class LongFormRenderer:
+    """
+    Renders documents of any length through a Synthesizer.
+
+    The text is segmented into sentence chunks within the model's limit. One thread
+    runs inference chunk after chunk while the caller's thread stitches finished
+    chunks into the output buffer, so post-processing overlaps the next inference.
+    Repeated chunks (refrains, boilerplate) are rendered once and reused.
+    """
+
+    def __init__(self, synthesizer, crossfade_ms: int = CROSSFADE_MS, paragraph_pause: float = PARAGRAPH_PAUSE,
+                 max_chars: Optional[int] = None, lookahead: int = 2):
+        self.synthesizer = synthesizer
+        self.crossfade_ms = crossfade_ms
+        self.paragraph_pause = paragraph_pause
+        self.max_chars = max_chars
+        self.lookahead = lookahead
+
+    def render(self, text: str, reference_audio_path: Optional[str] = None, language: str = "en",
+               latents: Optional[Dict] = None, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict]:
+        """Return (float32 audio, report) for a whole document."""
+        start = time.perf_counter()
+        with tracing.span("longform.segment"):
+            chunks = segment(text, language, self.max_chars)
+        if not chunks:
+            raise ValueError("Nothing to synthesize")
+
+        # Unique chunk texts in first-use order; each is rendered once
+        unique: Dict[str, int] = {}
+        for chunk, _ in chunks:
+            unique.setdefault(chunk, len(unique))
+        order = list(unique)
+
+        self.synthesizer.load_model()
+        sample_rate = self.synthesizer.sample_rate
+        rendered: "queue.Queue" = queue.Queue(maxsize=self.lookahead)
+        timings: Dict[int, Dict] = {}
+
+        def infer():
+            try:
+                for index, chunk in enumerate(order):
+                    t0 = time.perf_counter()
+                    with tracing.span("longform.chunk", index=index, chars=len(chunk)):
+                        # Per-chunk seeds keep a seeded document reproducible whatever its length
+                        # Raw output: the document is normalised as a whole, not chunk by chunk
+                        audio = self.synthesizer.synthesize(chunk, reference_audio_path, language, latents,
+                                                            None if seed is None else seed + index, normalize=False)
+                    timings[index] = {"inference_seconds": time.perf_counter() - t0}
+                    rendered.put((index, audio))
+            except Exception as e:
+                rendered.put((None, e))
+
+        worker = threading.Thread(target=infer, daemon=True)
+        worker.start()
+
+        # Estimate ~80 ms per character; the buffer grows if speech turns out slower
+        fade = int(sample_rate * self.crossfade_ms / 1000)
+        buffer = OutputBuffer(int(sum(len(c) for c, _ in chunks) * 0.08 * sample_rate), fade)
+        pause = int(self.paragraph_pause * sample_rate)
+        audio_by_index: Dict[int, np.ndarray] = {}
+        # Keep a rendered chunk only until its last use, so memory tracks the lookahead, not the document
+        last_use = {unique[chunk]: position for position, (chunk, _) in enumerate(chunks)}
+        seen = set()
+        report_chunks = []
+        previous_paragraph_end = True
+
+        for position, (chunk, ends_paragraph) in enumerate(chunks):
+            index = unique[chunk]
+            while index not in audio_by_index:
+                got, audio = rendered.get()
+                if got is None:
+                    raise audio
+                audio_by_index[got] = audio
+            audio = audio_by_index[index]
+            with tracing.span("longform.stitch"):
+                buffer.append(audio, crossfade=not previous_paragraph_end)
+                if ends_paragraph and position < len(chunks) - 1:
+                    buffer.silence(pause)
+            previous_paragraph_end = ends_paragraph
+            if last_use[index] == position:
+                del audio_by_index[index]
+            seconds = len(audio) / float(sample_rate)
+            reused = index in seen
+            seen.add(index)
+            report_chunks.append({
+                "position": position,
+                "index": index,
+                "chars": len(chunk),
+                "text": chunk[:60],
+                "audio_seconds": round(seconds, 3),
+                "inference_seconds": 0.0 if reused else round(timings[index]["inference_seconds"], 3),
+                "reused": reused,
+            })
+        worker.join()
+
+        audio = self.synthesizer.backend.postprocess(buffer.audio())
+        total = time.perf_counter() - start
+        inference = sum(t["inference_seconds"] for t in timings.values())
+        duration = len(audio) / float(sample_rate)
+        report = {
+            "chunks": report_chunks,
+            "total_chunks": len(chunks),
+            "unique_chunks": len(order),
+            "characters": len(text),
+            "audio_seconds": round(duration, 3),
+            "inference_seconds": round(inference, 3),
+            "total_seconds": round(total, 3),
+            "real_time_factor": round(total / duration, 3) if duration else 0.0,
+        }
+        return audio, report
+
+    def speak(self, text: str, output_path: str, reference_audio_path: Optional[str] = None, language: str = "en",
+              latents: Optional[Dict] = None, seed: Optional[int] = None, format: Optional[str] = None) -> Dict:
+        """Render a document to a file ('-' for stdout) and return the timing report."""
+        audio, report = self.render(text, reference_audio_path, language, latents, seed)
+        with tracing.span("output.write"):
+            encode.write(audio, self.synthesizer.sample_rate, output_path, format)
+        report["output"] = output_path
+        return report
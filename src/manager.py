@@ -1,55 +1,160 @@
 
 import os
+import re
 import json
 import shutil
 import glob
 import wave
-import numpy as np
-from scipy.io import wavfile
 from pathlib import Path
 from typing import List, Optional, Dict
+from src import tracing
+from src.utils import file_hash, append_wav_data, parallel_map
+from src.registry import VoiceRegistry, METADATA_FIELDS
+
+# XTTS loads conditioning audio at 22.05 kHz mono; a reference stored in exactly
+# that format is used as-is instead of being resampled/downmixed on every load.
+REFERENCE_SAMPLE_RATE = 22050
+DEFAULT_REFERENCE_SECONDS = 30.0
+MIN_REFERENCE_SCORE = 0.25  # Pure noise with no clipping scores 0.2 (see vad.quality_score)
+CLIP_METRICS = ("segments", "duration", "speech_seconds", "speech_ratio", "snr_db", "clipping", "score",
+                "sample_rate", "channels", "dtype")
 
 class VoiceManager:
-    def __init__(self, base_dir: str = "voices"):
+    def __init__(self, base_dir: str = "voices", reference_sample_rate: int = REFERENCE_SAMPLE_RATE,
+                 max_workers: Optional[int] = None):
         self.base_dir = Path(base_dir)
+        self.reference_sample_rate = reference_sample_rate
+        self.max_workers = max_workers
         self.base_dir.mkdir(exist_ok=True)
+        self.registry = VoiceRegistry(self.base_dir / "registry.db")
+        self.similarity_dir = self.base_dir / "similarity"
+        self._indexes = {}
+        if self.registry.is_new:
+            self.rebuild_registry()
         
     def create_new_recording_path(self, voice_name: str) -> str:
         """Generate a path for a new recording file."""
         voice_id = self._sanitize_name(voice_name)
         audio_dir = self.base_dir / voice_id / "audio"
-        count = len(list(audio_dir.glob("*.wav")))
-        return str(audio_dir / f"recording_{count + 1}.wav")
-        
-    def _trim_silence(self, audio: np.ndarray, threshold: float = 0.01) -> np.ndarray:
-        """Trim silence from start and end of audio array."""
-        magnitude = np.abs(audio)
-        if np.max(magnitude) < threshold:
-            return audio
-            
-        # Find start and end points
-        is_speech = magnitude > (np.max(magnitude) * threshold)
-        indices = np.where(is_speech)[0]
-        
-        if len(indices) == 0:
-            return audio
-            
-        start = indices[0]
-        end = indices[-1]
+        row = self._registry_row(voice_id)
+        index = row["next_clip"] if row else 1
+        # Files may have been dropped in by hand since the registry was updated
+        while (audio_dir / f"recording_{index}.wav").exists():
+            index += 1
+        if row:
+            self.registry.upsert(voice_id, next_clip=index + 1)
+        return str(audio_dir / f"recording_{index}.wav")
         
-        # Add a small buffer (0.1s at 22050Hz is ~2200 samples)
-        buffer = 2000
-        start = max(0, start - buffer)
-        end = min(len(audio), end + buffer)
-        
-        return audio[start:end]
+    def _load_manifest(self, voice_id: str) -> Dict:
+        path = self.base_dir / voice_id / "processed" / "manifest.json"
+        if path.exists():
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Ignoring unreadable refine manifest for {voice_id}: {e}")
+        return {"clips": []}
+
+    def _save_manifest(self, voice_id: str, manifest: Dict):
+        with open(self.base_dir / voice_id / "processed" / "manifest.json", 'w') as f:
+            json.dump(manifest, f, indent=4)
+
+    @staticmethod
+    def _clip_signature(wav_path: Path) -> Dict:
+        st = wav_path.stat()
+        return {"file": wav_path.name, "size": st.st_size, "mtime": st.st_mtime}
+
+    @tracing.traced("refine.analyse")
+    def _analyse_clips(self, wav_files: List[Path], known: Dict[str, Dict]) -> List[Dict]:
+        """
+        Manifest entries (speech segments and quality metrics) for every clip.
+        Cached entries are reused as long as a file's size and mtime are unchanged;
+        the rest are analysed in parallel across a process pool.
+        """
+        from src.audio import analyse_file
+
+        entries = {}
+        todo = []
+        for wav_path in wav_files:
+            signature = self._clip_signature(wav_path)
+            cached = known.get(wav_path.name)
+            if cached and "channels" in cached and all(cached.get(k) == v for k, v in signature.items()):
+                entries[wav_path.name] = cached
+            else:
+                todo.append((wav_path, signature))
+
+        results = parallel_map(analyse_file, [str(p) for p, _ in todo], max_workers=self.max_workers)
+        for (wav_path, entry), analysis in zip(todo, results):
+            entry.update({k: analysis[k] for k in CLIP_METRICS})
+            entries[wav_path.name] = entry
+            print(f"   {wav_path.name}: {analysis['duration']:.1f}s @ {analysis['sample_rate']} Hz, "
+                  f"speech {analysis['speech_ratio']:.0%} / silence {1 - analysis['speech_ratio']:.0%}, "
+                  f"SNR {analysis['snr_db']:.0f} dB, score {analysis['score']:.2f}")
+            if not analysis["segments"]:
+                print(f"   Warning: no speech detected in {wav_path.name}, it is only used if no clip has speech")
+        return [entries[p.name] for p in wav_files]
+
+    @tracing.traced("refine.load")
+    def _load_clips(self, audio_dir: Path, entries: List[Dict]) -> List:
+        """Decode clips' speech to mono float32 at the reference rate, in parallel."""
+        from src.audio import load_speech
+
+        return parallel_map(
+            load_speech,
+            [str(audio_dir / e["file"]) for e in entries],
+            [e["segments"] for e in entries],
+            [self.reference_sample_rate] * len(entries),
+            max_workers=self.max_workers
+        )
+
+    @staticmethod
+    def _select_reference(clips: List[Dict], previous: List[str], max_seconds: float) -> List[str]:
+        """
+        Pick the best clips whose combined speech fits in max_seconds (at least one clip).
+        Clips with no detected speech or a score below MIN_REFERENCE_SCORE are left out
+        whenever any usable clip exists.
+        Previously selected clips keep their order so an unchanged prefix can be appended to.
+        """
+        usable = [c for c in clips if c["segments"] and c["score"] >= MIN_REFERENCE_SCORE]
+        ranked = sorted(usable or clips, key=lambda c: c["score"], reverse=True)
+        chosen = set()
+        total = 0.0
+        for clip in ranked:
+            seconds = clip["speech_seconds"] or clip["duration"]
+            if chosen and total + seconds > max_seconds:
+                continue
+            chosen.add(clip["file"])
+            total += seconds
+        kept = [name for name in previous if name in chosen]
+        return kept + [c["file"] for c in ranked if c["file"] in chosen and c["file"] not in kept]
 
-    def process_audio(self, voice_name: str) -> bool:
+    @tracing.traced("refine")
+    def process_audio(self, voice_name: str, max_reference_seconds: Optional[float] = None) -> bool:
         """
         Refinement Logic:
-        Merge all .wav files in the audio directory into a single 'combined.wav'.
-        Trims silence from each clip before merging to avoid "glitchy" reference.
+        Score every .wav in the audio directory and merge the best ones into a single
+        'combined.wav', capped at max_reference_seconds of speech (default: the voice's
+        saved setting, else DEFAULT_REFERENCE_SECONDS). XTTS conditioning cost grows
+        with reference length, so the cap keeps synthesis cost flat however many
+        recordings a profile collects.
+
+        Trimming is frame-energy based (see src.vad): leading/trailing silence is
+        dropped and long interior pauses are shortened. Clips are ranked by SNR,
+        clipping and speech ratio.
+
+        Clips may have any sample rate, channel count or PCM dtype. The reference is
+        written as mono float32 at the model's conditioning rate, so synthesis never
+        has to resample or downmix it.
+
+        A manifest of analysed clips (size, mtime, segments, metrics) lives next to
+        'combined.wav', so only new or changed clips are analysed. When the selection
+        only grows, the new clips are appended in place; otherwise the (bounded)
+        reference is rebuilt from the selected clips.
         """
+        # Audio libraries are imported here so listing/lookups stay fast
+        import numpy as np
+        from scipy.io import wavfile
+
         voice_id = self._sanitize_name(voice_name)
         voice_dir = self.base_dir / voice_id
         audio_dir = voice_dir / "audio"
@@ -60,34 +165,76 @@ class VoiceManager:
             return False
             
         outfile = processed_dir / "combined.wav"
+        manifest = self._load_manifest(voice_id)
+        known = {clip["file"]: clip for clip in manifest["clips"]}
+        metadata = self._load_metadata(voice_id)
+        reference_info = metadata.get("reference", {})
+        if max_reference_seconds is None:
+            max_reference_seconds = reference_info.get("max_seconds", DEFAULT_REFERENCE_SECONDS)
         
         try:
-            combined_audio = []
-            sample_rate = 0
+            clips = self._analyse_clips(wav_files, known)
+            by_name = {c["file"]: c for c in clips}
+            previous = manifest.get("selected", []) if outfile.exists() else []
+            if manifest.get("sample_rate") != self.reference_sample_rate:
+                previous = []
+            # _analyse_clips hands back the cached entry itself for unchanged files, so
+            # anything else is new or modified; a modified selected clip invalidates the file
+            fresh = {c["file"] for c in clips if c is not known.get(c["file"])}
+            if any(name not in by_name or name in fresh for name in previous):
+                previous = []
+            selected = self._select_reference(clips, previous, max_reference_seconds)
+            reference_info = {
+                "max_seconds": max_reference_seconds,
+                "clips": selected,
+                "speech_seconds": round(sum(by_name[n]["speech_seconds"] or by_name[n]["duration"] for n in selected), 2),
+                "scores": {n: round(by_name[n]["score"], 3) for n in selected},
+            }
             
-            for wav_path in wav_files:
-                sr, audio = wavfile.read(str(wav_path))
-                sample_rate = sr
-                
-                # Normalize to float usually helpful, but keeping int16 is fine if consistent
-                # Trim silence
-                trimmed = self._trim_silence(audio)
-                combined_audio.append(trimmed)
-                
-                # Add a tiny bit of silence between clips (0.2s)
-                silence_len = int(sr * 0.2)
-                combined_audio.append(np.zeros(silence_len, dtype=audio.dtype))
+            if selected == previous:
+                manifest["clips"] = clips
+                self._save_manifest(voice_id, manifest)
+                # The cap (and scores) may still have changed, and new clips count even when not selected
+                if metadata and metadata.get("reference") != reference_info:
+                    metadata["reference"] = reference_info
+                    self._save_metadata(voice_id, metadata)
+                if self._registry_row(voice_id):
+                    self.registry.upsert(voice_id, clip_count=len(wav_files))
+                print(f"✓ Reference for '{voice_name}' is up to date ({len(selected)} of {len(clips)} samples)")
+                return True
             
-            if not combined_audio:
-                return False
-                
-            # Concatenate
-            final_audio = np.concatenate(combined_audio)
+            gap = np.zeros(int(self.reference_sample_rate * 0.2), dtype=np.float32)
+            appended = False
+            if previous and selected[:len(previous)] == previous:
+                segments = []
+                for speech in self._load_clips(audio_dir, [by_name[n] for n in selected[len(previous):]]):
+                    segments += [speech, gap]
+                with tracing.span("refine.write", mode="append"):
+                    appended = append_wav_data(outfile, np.concatenate(segments).tobytes())
             
-            # Write
-            wavfile.write(outfile, sample_rate, final_audio)
+            if not appended:
+                combined_audio = []
+                for speech in self._load_clips(audio_dir, [by_name[n] for n in selected]):
+                    # Add a tiny bit of silence between clips (0.2s)
+                    combined_audio += [speech, gap]
+                    
+                # Concatenate and write
+                with tracing.span("refine.write", mode="rebuild"):
+                    wavfile.write(outfile, self.reference_sample_rate, np.concatenate(combined_audio))
             
-            print(f"✓ Refinement complete: Merged {len(wav_files)} samples into {outfile}")
+            self._save_manifest(voice_id, {"clips": clips, "selected": selected,
+                                           "sample_rate": self.reference_sample_rate})
+            if metadata:
+                metadata["reference"] = reference_info
+                self._save_metadata(voice_id, metadata)
+
+            # The reference changed, so any cached conditioning latents are stale
+            self._invalidate_latents(voice_id)
+            self._update_reference(voice_id, outfile, clip_count=len(wav_files))
+            
+            action = "Appended to" if appended else "Built"
+            print(f"✓ Refinement complete: {action} {outfile} from {len(selected)} of {len(clips)} samples "
+                  f"({reference_info['speech_seconds']:.1f}s of speech, cap {max_reference_seconds:g}s)")
             return True
         except Exception as e:
             print(f"❌ Processing failed: {e}")
@@ -119,20 +266,90 @@ class VoiceManager:
         print(f"✓ Voice profile '{name}' created at {voice_dir}")
         return True
 
-    def list_voices(self) -> List[Dict]:
-        """List all available voice profiles."""
-        voices = []
-        if not self.base_dir.exists():
-            return voices
-            
-        for voice_dir in self.base_dir.iterdir():
-            if voice_dir.is_dir() and (voice_dir / "metadata.json").exists():
-                try:
-                    with open(voice_dir / "metadata.json", 'r') as f:
-                        voices.append(json.load(f))
-                except Exception as e:
-                    print(f"Warning: Could not read metadata for {voice_dir.name}: {e}")
-        return voices
+    def list_voices(self, limit: Optional[int] = None, offset: int = 0, query: Optional[str] = None) -> List[Dict]:
+        """List voice profiles from the registry, optionally paginated and filtered."""
+        return self.registry.list(limit=limit, offset=offset, query=query)
+
+    def count_voices(self, query: Optional[str] = None) -> int:
+        return self.registry.count(query)
+
+    def rebuild_registry(self) -> int:
+        """Re-index every voice directory on disk. Returns the number of voices found."""
+        rows = []
+        for voice_dir in sorted(self.base_dir.iterdir()):
+            if voice_dir.is_dir():
+                row = self._index_voice(voice_dir.name)
+                if row:
+                    rows.append(row)
+        self.registry.replace_all(rows)
+        return len(rows)
+
+    def _index_voice(self, voice_id: str) -> Optional[Dict]:
+        """Build a registry row for one voice by scanning its directory."""
+        voice_dir = self.base_dir / voice_id
+        if not (voice_dir / "metadata.json").exists():
+            return None
+        try:
+            with open(voice_dir / "metadata.json", 'r') as f:
+                metadata = json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not read metadata for {voice_dir.name}: {e}")
+            return None
+
+        wavs = list((voice_dir / "audio").glob("*.wav"))
+        numbers = [int(m.group(1)) for m in (re.fullmatch(r"recording_(\d+)\.wav", p.name) for p in wavs) if m]
+        row = {k: metadata.get(k) for k in METADATA_FIELDS}
+        row.update({
+            "id": voice_id,
+            "name": metadata.get("name") or voice_id,
+            "description": metadata.get("description", ""),
+            "clip_count": len(wavs),
+            "next_clip": max(numbers, default=len(wavs)) + 1,
+        })
+        reference = self._find_reference(voice_dir)
+        if reference:
+            row.update(self._reference_fields(reference))
+        return row
+
+    def _registry_row(self, voice_id: str) -> Optional[Dict]:
+        """Registry entry for a voice, indexing it from disk if it was added behind our back."""
+        row = self.registry.get(voice_id)
+        if row is None:
+            row = self._index_voice(voice_id)
+            if row:
+                self.registry.upsert(voice_id, **row)
+        return row
+
+    @staticmethod
+    def _reference_fields(reference: Path) -> Dict:
+        st = reference.stat()
+        return {
+            "reference_path": str(reference),
+            "reference_hash": file_hash(str(reference)),
+            "reference_size": st.st_size,
+            "reference_mtime": st.st_mtime,
+        }
+
+    def _update_reference(self, voice_id: str, reference: Path, **fields):
+        if self._registry_row(voice_id):
+            self.registry.upsert(voice_id, **self._reference_fields(reference), **fields)
+
+    @tracing.traced("reference.hash")
+    def get_reference_hash(self, voice_name: str) -> Optional[str]:
+        """Content hash of a voice's reference audio, served from the registry while the file is unchanged."""
+        ref_audio = self.get_reference_audio(voice_name)
+        if not ref_audio:
+            return None
+        voice_id = self._sanitize_name(voice_name)
+        row = self.registry.get(voice_id)
+        st = os.stat(ref_audio)
+        if (row and row["reference_path"] == ref_audio and row["reference_hash"]
+                and row["reference_size"] == st.st_size and row["reference_mtime"] == st.st_mtime):
+            return row["reference_hash"]
+        fields = self._reference_fields(Path(ref_audio))
+        if self._registry_row(voice_id):
+            self.registry.upsert(voice_id, **fields)
+        return fields["reference_hash"]
 
     def get_voice_path(self, voice_name: str) -> Optional[Path]:
         """Get the path to a voice directory by name or ID."""
@@ -140,19 +357,33 @@ class VoiceManager:
         path = self.base_dir / voice_id
         return path if path.exists() else None
         
+    @tracing.traced("reference.lookup")
     def get_reference_audio(self, voice_name: str) -> Optional[str]:
         """
         Get the best reference audio for inference.
         Prioritizes 'processed/combined.wav' -> 'audio/recording_0.wav' -> Any wav in audio.
+        The registry's answer is used while that file still exists.
         """
         path = self.get_voice_path(voice_name)
         if not path:
             return None
-            
+
+        row = self.registry.get(path.name)
+        if row and row["reference_path"] and os.path.exists(row["reference_path"]):
+            return row["reference_path"]
+
+        reference = self._find_reference(path)
+        if reference:
+            self._update_reference(path.name, reference)
+            return str(reference)
+        return None
+
+    def _find_reference(self, path: Path) -> Optional[Path]:
+        """Locate the reference audio for a voice directory on disk."""
         # 1. Check for processed/combined master file
         combined = path / "processed" / "combined.wav"
         if combined.exists():
-            return str(combined)
+            return combined
             
         # 2. Check for any raw recording
         audio_dir = path / "audio"
@@ -160,14 +391,134 @@ class VoiceManager:
         if wavs:
             # Sort to get deterministic result, e.g., the latest or first
             wavs.sort() 
-            return str(wavs[0])
+            return wavs[0]
             
         return None
 
+    def get_base_model(self, voice_name: str) -> Optional[str]:
+        """The voice's 'base_model' (which backend speaks it), or None for the default."""
+        row = self._registry_row(self._sanitize_name(voice_name))
+        return row["base_model"] if row else None
+
+    def _latents_path(self, voice_id: str, model_id: str) -> Path:
+        """Where a voice's latents for one model are cached; each model keeps its own file."""
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_id)
+        return self.base_dir / voice_id / "processed" / f"latents.{slug}.pt"
+
+    @tracing.traced("latents")
+    def get_conditioning_latents(self, voice_name: str, synthesizer) -> Optional[Dict]:
+        """
+        Return conditioning latents for a voice's reference audio (None if the
+        synthesizer's backend can't clone).
+        Latents are cached per model in 'processed/latents.<model>.pt', keyed by the
+        reference's content hash, and recomputed only when the reference changes.
+        Computing them for another model (e.g. by `similar`) leaves the others alone.
+        """
+        ref_audio = self.get_reference_audio(voice_name)
+        if not ref_audio or not synthesizer.capabilities.cloning:
+            return None
+
+        voice_id = self._sanitize_name(voice_name)
+        cache_path = self._latents_path(voice_id, synthesizer.model_id)
+        ref_hash = self.get_reference_hash(voice_name)
+
+        # 'latents.pt' is the single slot used before latents were kept per model
+        for path in (cache_path, cache_path.with_name("latents.pt")):
+            if not path.exists():
+                continue
+            with tracing.span("latents.load"):
+                cached = synthesizer.load_latents(str(path))
+            if cached and cached.get("reference_hash") == ref_hash and cached.get("model_name") == synthesizer.model_id:
+                self._index_embedding(voice_id, synthesizer, cached, ref_hash)
+                return cached
+
+        print(f"⏳ Computing conditioning latents for '{voice_name}'...")
+        latents = synthesizer.compute_latents(ref_audio)
+        latents["reference_hash"] = ref_hash
+        latents["model_name"] = synthesizer.model_id
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tracing.span("latents.save"):
+            synthesizer.save_latents(latents, str(cache_path))
+        self._index_embedding(voice_id, synthesizer, latents, ref_hash)
+        return latents
+
+    def _invalidate_latents(self, voice_id: str):
+        """Drop cached conditioning latents for every model (and the voice's similarity rows) after the reference audio changes."""
+        for cache_path in (self.base_dir / voice_id / "processed").glob("latents*.pt"):
+            cache_path.unlink()
+        if self.similarity_dir.exists():
+            from src.similarity import remove_voice
+            remove_voice(self.similarity_dir, voice_id)
+
+    def similarity_index(self, model_id: str):
+        """The speaker-embedding index of all voices for one model (see src.similarity)."""
+        from src.similarity import SimilarityIndex
+
+        if model_id not in self._indexes:
+            self._indexes[model_id] = SimilarityIndex(self.similarity_dir, model_id)
+        return self._indexes[model_id]
+
+    def _index_embedding(self, voice_id: str, synthesizer, latents: Dict, ref_hash: Optional[str]):
+        """Keep the voice's row in the similarity index in step with its latents."""
+        index = self.similarity_index(synthesizer.model_id)
+        if voice_id in index and index.hash_of(voice_id) == ref_hash:
+            return
+        embedding = synthesizer.backend.speaker_embedding(latents)
+        if embedding is not None:
+            with tracing.span("similarity.update"):
+                index.upsert(voice_id, embedding, ref_hash)
+
+    def update_similarity_index(self, synthesizer) -> int:
+        """
+        Index every voice whose reference isn't indexed yet (or changed) for this
+        synthesizer's model, and drop voices that no longer exist. Latents already
+        cached on disk are reused, so only new references need the model.
+        Returns the number of voices (re)indexed.
+        """
+        index = self.similarity_index(synthesizer.model_id)
+        voices = {v["id"]: v for v in self.registry.list() if v.get("reference_path")}
+        for voice_id in [v for v in index.voices() if v not in voices]:
+            index.remove(voice_id)
+        stale = [v for v in voices.values() if index.hash_of(v["id"]) != v["reference_hash"]]
+        for voice in stale:
+            self.get_conditioning_latents(voice["id"], synthesizer)
+        return len(stale)
+
+    @tracing.traced("similarity.search")
+    def find_similar(self, query: str, synthesizer, k: int = 5) -> List[Dict]:
+        """
+        The k voices that sound most like `query`, a voice name or a path to an
+        audio clip, as dicts of id, name and cosine similarity (best first).
+        """
+        index = self.similarity_index(synthesizer.model_id)
+        exclude = None
+        if os.path.isfile(query):
+            embedding = synthesizer.backend.speaker_embedding(synthesizer.compute_latents(query))
+        else:
+            exclude = self._sanitize_name(query)
+            if exclude not in index:
+                self.get_conditioning_latents(query, synthesizer)
+            embedding = index.vector(exclude)
+        if embedding is None:
+            raise ValueError(f"No speaker embedding for '{query}' with {synthesizer.model_id}")
+        results = []
+        for voice_id, score in index.search(embedding, k, exclude=exclude):
+            row = self.registry.get(voice_id) or {}
+            results.append({"id": voice_id, "name": row.get("name", voice_id), "similarity": score})
+        return results
+
     def _sanitize_name(self, name: str) -> str:
         """Convert display name to filesystem-safe ID."""
         return "".join(c for c in name.lower() if c.isalnum() or c in ('_', '-')).strip()
 
+    def _load_metadata(self, voice_id: str) -> Dict:
+        path = self.base_dir / voice_id / "metadata.json"
+        if not path.exists():
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
     def _save_metadata(self, voice_id: str, metadata: Dict):
         with open(self.base_dir / voice_id / "metadata.json", 'w') as f:
             json.dump(metadata, f, indent=4)
+        self.registry.upsert(voice_id, **{k: metadata.get(k) for k in METADATA_FIELDS})
@@ -0,0 +1,148 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from src.backends import Backend, create_backend, resolve
+
+# Budget for loaded models across the process, e.g. VOICE_MODEL_BUDGET_MB=6000 (unset: no limit)
+BUDGET_ENV = "VOICE_MODEL_BUDGET_MB"
+
+
+def _rss_mb() -> float:
+    from src.pool import memory_usage
+    return memory_usage().get("rss_mb", 0.0)
+
+
+class ModelRegistry:
+    """
+    The process's loaded models, shared by every Synthesizer (and anything else) that asks.
+
+    Models are keyed by base model, device and the options that change the
+    weights, so two callers asking for xtts_v2 on the CPU get the same loaded
+    backend instead of two copies. Each load records its memory footprint
+    (from the backend, or the process's RSS growth when it can't tell). When
+    the loaded total exceeds `budget_mb`, the least recently used models are
+    unloaded; they stay registered and load again on their next use.
+    """
+
+    def __init__(self, budget_mb: Optional[float] = None):
+        self.budget_mb = budget_mb
+        self._backends: "OrderedDict[Tuple, Backend]" = OrderedDict()  # Least recently used first
+        self._footprints: Dict[Tuple, float] = {}                      # MB, for loaded models
+        self._last_used: Dict[Tuple, float] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def key(base_model: Optional[str] = None, **options) -> Tuple:
+        # Unset options (None/False) are left out, so callers that omit them share a key with ones that don't
+        set_options = ((k, v) for k, v in options.items() if v is not None and v is not False)
+        return resolve(base_model), tuple(sorted(set_options))
+
+    def backend(self, base_model: Optional[str] = None, **options) -> Backend:
+        """The shared backend for a model and options, created (not loaded) on first request."""
+        key = self.key(base_model, **options)
+        with self._lock:
+            if key not in self._backends:
+                backend = create_backend(base_model, **options)
+                backend.loader = self.load
+                self._backends[key] = backend
+            return self._backends[key]
+
+    def get(self, base_model: Optional[str] = None, **options) -> Backend:
+        """The shared backend for a model and options, loaded."""
+        return self.load(self.backend(base_model, **options))
+
+    def _key_of(self, backend: Backend) -> Optional[Tuple]:
+        for key, candidate in self._backends.items():
+            if candidate is backend:
+                return key
+        return None
+
+    def load(self, backend: Backend) -> Backend:
+        """Load a backend if needed and mark it as just used, evicting others over the budget."""
+        with self._lock:
+            key = self._key_of(backend)
+            if key is None:
+                backend.load()  # Not ours (e.g. handed to a Synthesizer directly): no accounting
+                return backend
+            self._backends.move_to_end(key)
+            self._last_used[key] = time.time()
+            if backend.loaded and key in self._footprints:
+                return backend
+            before = _rss_mb()
+            backend.load()
+            reported = backend.memory_bytes()
+            self._footprints[key] = reported / (1024.0 * 1024.0) if reported is not None else max(0.0, _rss_mb() - before)
+            self._enforce_budget(keep=key)
+            return backend
+
+    def _enforce_budget(self, keep: Tuple):
+        if self.budget_mb is None:
+            return
+        for key in list(self._backends):
+            if self.total_mb() <= self.budget_mb:
+                break
+            if key != keep and key in self._footprints:
+                self._evict(key)
+        if self.total_mb() > self.budget_mb:
+            print(f"Warning: {self._backends[keep].model_id} alone needs {self._footprints[keep]:.0f} MB, "
+                  f"over the {self.budget_mb:.0f} MB model budget")
+
+    def _evict(self, key: Tuple, reason: str = " to stay within the model budget"):
+        backend = self._backends[key]
+        print(f"♻️  Unloading {backend.model_id} ({self._footprints[key]:.0f} MB){reason}")
+        backend.unload()
+        del self._footprints[key]
+
+    def evict(self, backend: Backend):
+        """Unload a model now; it loads again on its next use."""
+        with self._lock:
+            key = self._key_of(backend)
+            if key is not None and key in self._footprints:
+                self._evict(key, reason="")
+
+    def clear(self):
+        """Unload everything and forget every backend."""
+        with self._lock:
+            for key in list(self._footprints):
+                self._evict(key, reason="")
+            self._backends.clear()
+            self._last_used.clear()
+
+    def total_mb(self) -> float:
+        """Combined footprint of the loaded models."""
+        return sum(self._footprints.values())
+
+    def usage(self) -> List[Dict]:
+        """One row per registered model, most recently used first."""
+        with self._lock:
+            rows = []
+            for key, backend in reversed(self._backends.items()):
+                loaded = key in self._footprints and backend.loaded
+                rows.append({
+                    "model": backend.model_id,
+                    "device": backend.device or "auto",
+                    "loaded": loaded,
+                    "memory_mb": round(self._footprints[key], 1) if loaded else 0.0,
+                    "last_used": self._last_used.get(key),
+                })
+            return rows
+
+
+def _budget_from_env() -> Optional[float]:
+    value = os.environ.get(BUDGET_ENV)
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        # Runs at import, possibly before `--out -` has moved prints off stdout
+        print(f"Warning: ignoring {BUDGET_ENV}={value!r} (not a number of MB); models are loaded without a budget",
+              file=sys.stderr)
+        return None
+
+
+# The process-wide registry
+MODELS = ModelRegistry(budget_mb=_budget_from_env())
@@ -0,0 +1,197 @@
+import gc
+import os
+import queue
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Set in the parent just before forking; each worker inherits it copy-on-write
+_SHARED = {}
+
+
+def memory_usage() -> Dict[str, float]:
+    """
+    This process's memory in MB from /proc/self/smaps_rollup (Linux).
+    'private' is what the process alone holds; 'pss' splits shared pages between
+    their sharers, so summing pss over the pool gives its real footprint.
+    """
+    usage = {}
+    try:
+        with open("/proc/self/smaps_rollup", 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1].isdigit():
+                    usage[parts[0].rstrip(":")] = int(parts[1]) / 1024.0
+    except OSError:
+        return {}
+    return {
+        "rss_mb": usage.get("Rss", 0.0),
+        "pss_mb": usage.get("Pss", 0.0),
+        "shared_mb": usage.get("Shared_Clean", 0.0) + usage.get("Shared_Dirty", 0.0),
+        "private_mb": usage.get("Private_Clean", 0.0) + usage.get("Private_Dirty", 0.0),
+    }
+
+
+def core_slices(workers: int) -> List[List[int]]:
+    """Split the CPUs this process may run on into `workers` contiguous, near-equal slices."""
+    if hasattr(os, "sched_getaffinity"):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(os.cpu_count() or 1))
+    workers = max(1, min(workers, len(cores)))
+    size, extra = divmod(len(cores), workers)
+    slices, start = [], 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        slices.append(cores[start:end])
+        start = end
+    return slices
+
+
+def _worker(index: int, cores: List[int], threads: int, tasks, results):
+    """Worker loop: pin to its cores, then render jobs until the None sentinel."""
+    from src.manager import VoiceManager
+    from src.batch import audio_duration
+    from src.encode import format_for_path
+
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass  # Backends without torch (stub, ONNX) size their own thread pools
+
+    default = _SHARED["synthesizer"]
+    # A fresh manager: the parent's SQLite connection must not be used across fork
+    manager = VoiceManager(_SHARED["base_dir"])
+    latents_by_voice = {}
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        job_id, job = task
+        result = {"id": job_id, "worker": index, "output": job["output"], "error": None}
+        t0 = time.perf_counter()
+        try:
+            ref_audio = manager.get_reference_audio(job["voice"])
+            if not ref_audio:
+                raise ValueError(f"voice '{job['voice']}' has no reference audio")
+            # Backends the parent preloaded for these jobs are shared; any other would load its own copy here
+            synthesizer = default.using(manager.get_base_model(job["voice"]))
+            latents = None
+            ref_hash = manager.get_reference_hash(job["voice"])
+            if not synthesizer.is_cached(job["text"], ref_audio, job["language"], job["seed"],
+                                         format_for_path(job["output"]), ref_hash):
+                if job["voice"] not in latents_by_voice:
+                    latents_by_voice[job["voice"]] = manager.get_conditioning_latents(job["voice"], synthesizer)
+                latents = latents_by_voice[job["voice"]]
+            Path(job["output"]).parent.mkdir(parents=True, exist_ok=True)
+            synthesizer.speak(text=job["text"], output_path=job["output"], reference_audio_path=ref_audio,
+                              language=job["language"], latents=latents, seed=job["seed"], reference_hash=ref_hash)
+            result["audio_seconds"] = audio_duration(job["output"])
+        except Exception as e:
+            result["error"] = str(e)
+        result["elapsed"] = time.perf_counter() - t0
+        result["memory"] = memory_usage()
+        results.put(result)
+
+
+class WorkerPool:
+    """
+    Runs speak jobs across forked worker processes that share one loaded model.
+
+    The parent loads the models the jobs need (one per distinct base_model of
+    their voices, not the default unless a job uses it) and forks; the weights
+    are never written after loading, so the workers share those pages
+    copy-on-write instead of each holding a copy. Every worker is pinned to its own slice of cores with a
+    matching torch thread count, so workers don't contend for the same CPUs.
+    Linux/CPU only: fork is unsafe with MPS/CUDA contexts.
+    """
+
+    def __init__(self, manager, synthesizer, workers: int = 2, threads_per_worker: Optional[int] = None):
+        self.manager = manager
+        self.synthesizer = synthesizer
+        self.slices = core_slices(workers)
+        self.workers = len(self.slices)
+        self.threads_per_worker = threads_per_worker
+        self._procs = []
+        self._tasks = None
+        self._results = None
+
+    def _synthesizers_for(self, jobs: Optional[List[Dict]]) -> List:
+        """The distinct synthesizers (one per base model) the jobs' voices speak through."""
+        if jobs is None:
+            return [self.synthesizer]
+        synthesizers = {}
+        for voice in {job["voice"] for job in jobs}:
+            synthesizer = self.synthesizer.using(self.manager.get_base_model(voice))
+            synthesizers[id(synthesizer)] = synthesizer
+        return list(synthesizers.values())
+
+    def start(self, jobs: Optional[List[Dict]] = None):
+        """Load the models `jobs` need (the default model if not given) and fork the workers."""
+        import multiprocessing
+
+        if self._procs:
+            return
+        ctx = multiprocessing.get_context("fork")
+        start = time.perf_counter()
+        # Workers reach these through the default's using(), so they inherit the loaded siblings
+        self.models = []
+        for synthesizer in self._synthesizers_for(jobs):
+            synthesizer.load_model()
+            synthesizer.backend.to_cpu()
+            self.models.append(synthesizer.model_id)
+        self.load_seconds = time.perf_counter() - start
+        self.parent_memory = memory_usage()
+
+        _SHARED["synthesizer"] = self.synthesizer
+        _SHARED["base_dir"] = str(self.manager.base_dir)
+        # Keep the collector from touching (and so un-sharing) every object the parent holds
+        gc.freeze()
+
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        for index, cores in enumerate(self.slices):
+            threads = self.threads_per_worker or len(cores)
+            proc = ctx.Process(target=_worker, args=(index, cores, threads, self._tasks, self._results), daemon=True)
+            proc.start()
+            self._procs.append(proc)
+        print(f"✓ Started {self.workers} workers ({', '.join(str(len(c)) for c in self.slices)} cores each) "
+              f"sharing {', '.join(self.models)}")
+
+    def imap(self, jobs: List[Dict]) -> Iterator[Dict]:
+        """Dispatch jobs to the workers and yield each result as it completes (in completion order)."""
+        self.start(jobs)
+        for job_id, job in enumerate(jobs):
+            self._tasks.put((job_id, job))
+        remaining = len(jobs)
+        while remaining:
+            try:
+                result = self._results.get(timeout=1.0)
+            except queue.Empty:
+                dead = [p for p in self._procs if not p.is_alive()]
+                if dead:
+                    raise RuntimeError(f"{len(dead)} synthesis worker(s) exited unexpectedly")
+                continue
+            remaining -= 1
+            yield result
+
+    def shutdown(self):
+        for _ in self._procs:
+            self._tasks.put(None)
+        for proc in self._procs:
+            proc.join(timeout=10)
+            if proc.is_alive():
+                proc.terminate()
+        self._procs = []
+        gc.unfreeze()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
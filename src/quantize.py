@@ -0,0 +1,168 @@
+"""
+Dynamic int8 quantisation for CPU inference, and an fp32-vs-int8 comparison report.
+
+Each variant of the comparison runs in its own subprocess, so its peak RSS is
+measured in isolation and the other variant's weights can't inflate it.
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def conv1d_to_linear(module) -> int:
+    """
+    Replace HuggingFace GPT-2 Conv1D layers (used for XTTS's GPT attention/MLP)
+    with equivalent nn.Linear layers, which dynamic quantisation understands.
+    Returns the number of layers converted.
+    """
+    import torch
+
+    converted = 0
+    for name, child in module.named_children():
+        if type(child).__name__ == "Conv1D":
+            nx, nf = child.weight.shape
+            linear = torch.nn.Linear(nx, nf)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, name, linear)
+            converted += 1
+        else:
+            converted += conv1d_to_linear(child)
+    return converted
+
+
+def quantize_xtts(model) -> Dict:
+    """Apply dynamic int8 quantisation to the linear layers of the XTTS GPT and HiFi-GAN decoder."""
+    import torch
+
+    converted = conv1d_to_linear(model.gpt)
+    for attr in ("gpt", "hifigan_decoder"):
+        sub = getattr(model, attr, None)
+        if sub is not None:
+            torch.ao.quantization.quantize_dynamic(sub, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return {"conv1d_converted": converted}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux but bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def spectral_similarity(path_a: str, path_b: str) -> Dict:
+    """
+    Compare two renders of the same text.
+    With sampling, quantised and fp32 outputs never match sample-for-sample, so
+    this compares their long-term average log spectra (cosine similarity) and
+    their durations instead.
+    """
+    import numpy as np
+    from scipy.io import wavfile
+    from src.vad import to_float
+
+    def ltas(path):
+        sr, audio = wavfile.read(path)
+        x = to_float(audio)
+        n_fft = 1024
+        frames = np.lib.stride_tricks.sliding_window_view(x, n_fft)[::n_fft // 2]
+        spectrum = np.abs(np.fft.rfft(frames * np.hanning(n_fft), axis=1))
+        return np.log10(spectrum.mean(axis=0) + 1e-8), len(x) / float(sr)
+
+    a, dur_a = ltas(path_a)
+    b, dur_b = ltas(path_b)
+    a, b = a - a.mean(), b - b.mean()
+    cosine = float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-12))
+    return {"spectral_cosine": cosine, "duration_ratio": dur_b / dur_a if dur_a else 0.0}
+
+
+def _run_variant(voice: str, text: str, language: str, seed: int, output: str, quantize: bool,
+                 threads: Optional[int], interop_threads: Optional[int]) -> Dict:
+    """Render once in this process and report timings (called in the worker subprocess)."""
+    from src.manager import VoiceManager
+    from src.synthesis import Synthesizer
+    from src.batch import audio_duration
+
+    manager = VoiceManager()
+    synthesizer = Synthesizer(quantize=quantize, threads=threads, interop_threads=interop_threads)
+    t0 = time.perf_counter()
+    synthesizer.load_model()
+    load_seconds = time.perf_counter() - t0
+    latents = manager.get_conditioning_latents(voice, synthesizer)
+    t0 = time.perf_counter()
+    synthesizer.speak(text=text, output_path=output, reference_audio_path=manager.get_reference_audio(voice),
+                      language=language, latents=latents, seed=seed)
+    synthesis_seconds = time.perf_counter() - t0
+    seconds = audio_duration(output)
+    return {
+        "quantize": quantize,
+        "load_seconds": load_seconds,
+        "synthesis_seconds": synthesis_seconds,
+        "audio_seconds": seconds,
+        "real_time_factor": synthesis_seconds / seconds if seconds else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "output": output,
+    }
+
+
+def compare(voice: str, text: str, language: str = "en", seed: int = 0, out_dir: str = "quantize_report",
+            threads: Optional[int] = None, interop_threads: Optional[int] = None) -> Dict:
+    """Render the same text in fp32 and int8 (separate processes) and compare speed, memory and audio."""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    results = {}
+    for name, quantize in (("fp32", False), ("int8", True)):
+        cmd = [sys.executable, "-m", "src.quantize", voice, text, "--lang", language, "--seed", str(seed),
+               "--out", str(out / f"{name}.wav"), "--json", str(out / f"{name}.json")]
+        if quantize:
+            cmd.append("--quantize")
+        if threads:
+            cmd += ["--threads", str(threads)]
+        if interop_threads:
+            cmd += ["--interop-threads", str(interop_threads)]
+        print(f"⏳ Rendering {name}...")
+        subprocess.run(cmd, check=True)
+        with open(out / f"{name}.json", 'r') as f:
+            results[name] = json.load(f)
+
+    report = {
+        "voice": voice,
+        "text_length": len(text),
+        "seed": seed,
+        "threads": threads,
+        "interop_threads": interop_threads,
+        "fp32": results["fp32"],
+        "int8": results["int8"],
+        "similarity": spectral_similarity(results["fp32"]["output"], results["int8"]["output"]),
+    }
+    with open(out / "report.json", 'w') as f:
+        json.dump(report, f, indent=4)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render one utterance and report timings (quantisation report worker)")
+    parser.add_argument("voice")
+    parser.add_argument("text")
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--json", required=True)
+    parser.add_argument("--quantize", action="store_true")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--interop-threads", type=int, default=None)
+    args = parser.parse_args()
+
+    result = _run_variant(args.voice, args.text, args.lang, args.seed, args.out, args.quantize,
+                          args.threads, args.interop_threads)
+    with open(args.json, 'w') as f:
+        json.dump(result, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,262 @@
-
-import sounddevice as sd
 import numpy as np
-from scipy.io.wavfile import write
+import queue
+import threading
 import time
 import sys
+import wave
+from collections import deque
 from pathlib import Path
+from typing import Callable, Optional
+
+class SoundDeviceInput:
+    """Microphone input through a sounddevice InputStream (the default device layer)."""
+
+    def __init__(self, device=None):
+        self.device = device
+
+    def open(self, sample_rate: int, blocksize: int, callback: Callable[[Optional[np.ndarray]], None]):
+        """
+        Return a context manager that delivers mono float32 blocks to callback while open.
+        Any input layer with this method can be swapped in; a None block signals end of input.
+        """
+        import sounddevice as sd
+
+        def on_audio(indata, frames, time_info, status):
+            callback(indata[:, 0].copy())
+
+        return sd.InputStream(samplerate=sample_rate, blocksize=blocksize, channels=1,
+                              dtype="float32", device=self.device, callback=on_audio)
+
+
+class ArrayInput:
+    """
+    Feeds a prerecorded/synthetic float signal block by block, for tests and benchmarks.
+    Unless realtime, blocks arrive as fast as the recorder takes them (never dropped).
+    """
+
+    def __init__(self, signal: np.ndarray, realtime: bool = False):
+        self.signal = np.asarray(signal, dtype=np.float32)
+        self.realtime = realtime
+        self.blocking = not realtime
+
+    def open(self, sample_rate: int, blocksize: int, callback: Callable[[Optional[np.ndarray]], None]):
+        return _ArrayStream(self, sample_rate, blocksize, callback)
+
+
+class _ArrayStream:
+    def __init__(self, source: ArrayInput, sample_rate: int, blocksize: int, callback):
+        self.source, self.sample_rate, self.blocksize, self.callback = source, sample_rate, blocksize, callback
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        for start in range(0, len(self.source.signal), self.blocksize):
+            if self._stop.is_set():
+                return
+            self.callback(self.source.signal[start:start + self.blocksize])
+            if self.source.realtime:
+                time.sleep(self.blocksize / self.sample_rate)
+        self.callback(None)  # End of input
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class OnlineVAD:
+    """
+    Block-level voice activity detection for live input.
+    The noise floor is learned from the first quiet blocks and then tracked on
+    blocks judged silent; a block is speech when it rises clearly above it.
+    Blocks louder than `calibration_ceiling_db` above `min_level` never count
+    toward the floor, so a speaker who starts talking at once isn't taken for
+    noise; until quiet blocks arrive, anything above `min_level` is speech.
+    """
+
+    def __init__(self, ratio_db: float = 12.0, min_level: float = 0.005, calibration_blocks: int = 5,
+                 calibration_ceiling_db: float = 18.0):
+        self.ratio = 10 ** (ratio_db / 20)
+        self.min_level = min_level
+        self.calibration_blocks = calibration_blocks
+        self.calibration_ceiling = min_level * 10 ** (calibration_ceiling_db / 20)
+        self.noise = None
+        self._calibrated = 0
+
+    def is_speech(self, block: np.ndarray) -> bool:
+        rms = float(np.sqrt(np.mean(block * block))) if len(block) else 0.0
+        if self._calibrated < self.calibration_blocks and rms <= self.calibration_ceiling:
+            self.noise = rms if self.noise is None else min(self.noise, rms)
+            self._calibrated += 1
+        floor = self.noise if self.noise is not None else 0.0
+        speech = rms > max(floor * self.ratio, self.min_level)
+        if not speech and self.noise is not None:
+            self.noise = 0.95 * self.noise + 0.05 * rms
+        return speech
+
 
 class AudioRecorder:
-    def __init__(self, sample_rate=22050):
+    def __init__(self, sample_rate=22050, input_device=None, block_ms: int = 50, buffer_seconds: float = 10.0):
         self.fs = sample_rate  # XTTS performs best with 22050 or 24000
-        
+        self.input = input_device or SoundDeviceInput()
+        self.blocksize = int(self.fs * block_ms / 1000)
+        # Ring buffer between the audio callback and the writer; sized generously
+        # so a slow disk never makes the callback block or drop input
+        self.max_blocks = max(1, int(buffer_seconds * 1000 / block_ms))
+        self.overruns = 0
+
     def list_devices(self):
+        import sounddevice as sd
         print("\nAvailable Audio Devices:")
         print(sd.query_devices())
-        
-    def record(self, duration_sec: int, output_path: str):
-        """Record audio for a fixed duration."""
-        print(f"\n🎙️  Recording for {duration_sec} seconds...")
+
+    def record(self, duration_sec: int, output_path: str, stop_on_silence: Optional[float] = None,
+               trim: bool = True, padding: float = 0.2):
+        """
+        Record up to duration_sec seconds, streaming blocks straight into the WAV.
+
+        stop_on_silence: stop early once this many seconds of silence follow speech.
+        trim: drop leading silence and the trailing silence tail as they are recorded
+        (keeping `padding` seconds either side), instead of writing it and trimming later.
+        A take in which the live VAD never hears speech is kept untrimmed, so refine's
+        offline VAD makes the final call rather than the recording being lost.
+        """
+        print(f"\n🎙️  Recording for up to {duration_sec} seconds...")
         print("   (Speak clearly and normally)")
-        
+
+        blocks: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=self.max_blocks)
+        self.overruns = 0
+
+        # A live device callback must never block, so a full buffer drops (and counts) the
+        # block; inputs that set `blocking` (synthetic feeds) wait for space instead
+        blocking = getattr(self.input, "blocking", False)
+        # Set once the writer stops taking blocks, so a waiting feed gives up instead of
+        # blocking forever (and hanging the input's shutdown) when recording ends early
+        stopped = threading.Event()
+
+        def on_block(block: Optional[np.ndarray]):
+            if block is None or blocking:
+                while not stopped.is_set():
+                    try:
+                        blocks.put(block, timeout=0.1)
+                        return
+                    except queue.Full:
+                        continue
+                return
+            try:
+                blocks.put_nowait(block)
+            except queue.Full:
+                self.overruns += 1
+
+        vad = OnlineVAD()
+        block_seconds = self.blocksize / self.fs
+        pad_blocks = max(1, int(round(padding / block_seconds)))
+        preroll = deque(maxlen=pad_blocks)   # silence kept before speech starts
+        pending = []                         # silence after speech, written only if speech resumes
+        heard_speech = False
+        captured = 0
+        total = int(duration_sec * self.fs)
+        next_dot = self.fs
+        untrimmed_path = Path(f"{output_path}.untrimmed.tmp")
+        untrimmed = None                     # everything before speech, in case speech is never heard
+
         try:
-            # Record
-            recording = sd.rec(int(duration_sec * self.fs), samplerate=self.fs, channels=1)
-            
-            # Show progress bar
-            for _ in range(duration_sec):
-                time.sleep(1)
-                sys.stdout.write(".")
-                sys.stdout.flush()
-            print("\n")
-            
-            sd.wait()  # Wait until recording is finished
-            
-            # Save raw file
-            # Scale to 16-bit integer for WAV compatibility if needed, 
-            # or scipy handles float32 (-1.0 to 1.0) usually fine.
-            # Best practice for compatibility: convert to int16.
-            recording_int16 = (recording * 32767).astype(np.int16)
-            
             # Ensure directory exists
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-            
-            write(output_path, self.fs, recording_int16)
-            print(f"✓ Saved recording to: {output_path}")
+
+            with wave.open(output_path, "wb") as wav, self.input.open(self.fs, self.blocksize, on_block):
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(self.fs)
+
+                def write(block, target=wav):
+                    # Scale to 16-bit integer for WAV compatibility
+                    target.writeframes((np.clip(block, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+
+                try:
+                    while captured < total:
+                        try:
+                            block = blocks.get(timeout=5.0)
+                        except queue.Empty:
+                            raise RuntimeError("audio input stopped delivering data")
+                        if block is None:
+                            break
+                        block = block[:total - captured]
+                        captured += len(block)
+
+                        # Show progress
+                        while captured >= next_dot:
+                            sys.stdout.write(".")
+                            sys.stdout.flush()
+                            next_dot += self.fs
+
+                        if not trim and stop_on_silence is None:
+                            write(block)
+                            continue
+
+                        if vad.is_speech(block):
+                            if not heard_speech:
+                                for b in preroll:
+                                    write(b)
+                                heard_speech = True
+                                if untrimmed is not None:
+                                    untrimmed.close()
+                                    untrimmed_path.unlink(missing_ok=True)
+                                    untrimmed = None
+                            for b in pending:
+                                write(b)
+                            pending = []
+                            write(block)
+                        elif not heard_speech:
+                            if trim:
+                                preroll.append(block)
+                                if untrimmed is None:
+                                    untrimmed = wave.open(str(untrimmed_path), "wb")
+                                    untrimmed.setnchannels(1)
+                                    untrimmed.setsampwidth(2)
+                                    untrimmed.setframerate(self.fs)
+                                write(block, untrimmed)
+                            else:
+                                write(block)
+                        else:
+                            pending.append(block)
+                            if stop_on_silence is not None and len(pending) * block_seconds >= stop_on_silence:
+                                print(" (silence detected, stopping)", end="")
+                                break
+                finally:
+                    stopped.set()
+
+                # Trailing silence: keep only the padding when trimming
+                for b in (pending[:pad_blocks] if trim else pending):
+                    write(b)
+                written = wav.getnframes()
+            print("\n")
+
+            if self.overruns:
+                print(f"Warning: {self.overruns} audio blocks were dropped (writer too slow)")
+            if untrimmed is not None:
+                # Speech was never detected live: keep the whole take and let refine judge it
+                written = untrimmed.getnframes()
+                untrimmed.close()
+                untrimmed = None
+                untrimmed_path.replace(output_path)
+                if written:
+                    print("⚠️  No speech detected while recording; kept the take untrimmed")
+            if not written:
+                Path(output_path).unlink(missing_ok=True)
+                print("❌ Nothing was recorded")
+                return False
+
+            print(f"✓ Saved recording to: {output_path} ({written / self.fs:.1f}s)")
             return True
-            
+
         except Exception as e:
             print(f"❌ Recording failed: {e}")
             return False
+        finally:
+            if untrimmed is not None:
+                untrimmed.close()
+                untrimmed_path.unlink(missing_ok=True)
@@ -0,0 +1,100 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS voices (
+    id              TEXT PRIMARY KEY,
+    name            TEXT NOT NULL,
+    description     TEXT NOT NULL DEFAULT '',
+    created_at      TEXT,
+    base_model      TEXT,
+    clip_count      INTEGER NOT NULL DEFAULT 0,
+    next_clip       INTEGER NOT NULL DEFAULT 1,
+    reference_path  TEXT,
+    reference_hash  TEXT,
+    reference_size  INTEGER,
+    reference_mtime REAL,
+    updated_at      REAL
+);
+CREATE INDEX IF NOT EXISTS idx_voices_name ON voices(name COLLATE NOCASE);
+"""
+
+METADATA_FIELDS = ("name", "description", "created_at", "base_model")
+COLUMNS = METADATA_FIELDS + ("clip_count", "next_clip", "reference_path", "reference_hash",
+                             "reference_size", "reference_mtime")
+
+
+class VoiceRegistry:
+    """
+    SQLite index of voice profiles.
+
+    The per-voice directories stay the source of truth; this table mirrors their
+    metadata, clip counts and reference files so listings and lookups don't have
+    to walk the voices directory. It can always be rebuilt from disk.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.is_new = not self.db_path.exists()
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def upsert(self, voice_id: str, **fields):
+        """Insert a voice or update the given columns of an existing one."""
+        fields = {k: v for k, v in fields.items() if k in COLUMNS}
+        fields["updated_at"] = time.time()
+        with self._lock, self.conn:
+            updated = self.conn.execute(
+                f"UPDATE voices SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?",
+                (*fields.values(), voice_id)
+            ).rowcount
+            if not updated:
+                self.conn.execute(
+                    f"INSERT INTO voices (id, {', '.join(fields)}) VALUES (?, {', '.join('?' for _ in fields)})",
+                    (voice_id, *fields.values())
+                )
+
+    def get(self, voice_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM voices WHERE id = ?", (voice_id,)).fetchone()
+        return dict(row) if row else None
+
+    def _where(self, query: Optional[str]):
+        if not query:
+            return "", ()
+        like = f"%{query}%"
+        return " WHERE name LIKE ? OR id LIKE ? OR description LIKE ?", (like, like, like)
+
+    def list(self, limit: Optional[int] = None, offset: int = 0, query: Optional[str] = None) -> List[Dict]:
+        """Voices ordered by name, optionally filtered by a substring of name, id or description."""
+        where, params = self._where(query)
+        sql = f"SELECT * FROM voices{where} ORDER BY name COLLATE NOCASE, id LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self.conn.execute(sql, (*params, -1 if limit is None else limit, offset)).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self, query: Optional[str] = None) -> int:
+        where, params = self._where(query)
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM voices{where}", params).fetchone()[0]
+
+    def delete(self, voice_id: str):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM voices WHERE id = ?", (voice_id,))
+
+    def replace_all(self, voices: Iterable[Dict]):
+        """Atomically replace the whole index, e.g. after a rescan of the voices directory."""
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM voices")
+            self.conn.executemany(
+                f"INSERT INTO voices (id, {', '.join(COLUMNS)}, updated_at) "
+                f"VALUES (?, {', '.join('?' for _ in COLUMNS)}, ?)",
+                [(v["id"], *(v.get(k) for k in COLUMNS), now) for v in voices]
+            )
@@ -0,0 +1,334 @@
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+# http.server/urllib are imported where used: the CLI imports this module for its
+# defaults on every run, including commands that never touch the network.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5002
+DEFAULT_URL = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+
+
+class ServerError(Exception):
+    """Raised by SynthesisClient when the server rejects or fails a request."""
+
+    def __init__(self, message: str, status: int = 0):
+        super().__init__(message)
+        self.status = status
+
+
+class SpeakJob:
+    """A single queued speak request and its eventual result."""
+
+    def __init__(self, voice: str, text: str, language: str, output_path: Optional[str], seed: Optional[int] = None,
+                 format: Optional[str] = None, deadline: Optional[float] = None):
+        self.voice = voice
+        self.text = text
+        self.language = language
+        self.output_path = output_path  # None: return the encoded audio instead of writing a file
+        self.seed = seed
+        self.format = format
+        self.deadline = deadline  # time.monotonic() by which the client stops waiting
+        self.done = threading.Event()
+        self.cancelled = False
+        self.timed_out = False
+        self.result: Union[str, bytes, None] = None
+        self.error: Optional[str] = None
+
+    @property
+    def expired(self) -> bool:
+        """True once nobody is waiting for the result any more."""
+        return self.cancelled or (self.deadline is not None and time.monotonic() >= self.deadline)
+
+    def check(self):
+        """Raise TimeoutError if the job expired; the worker calls this between stages."""
+        if self.expired:
+            raise TimeoutError("timed out")
+
+
+class SynthesisServer:
+    """
+    Keeps one Synthesizer warm and serves speak requests over local HTTP.
+
+    Requests go through a bounded queue drained by a single worker thread, so the
+    model is never used concurrently. A full queue is rejected immediately (503)
+    rather than piling up, and each request waits at most `timeout` seconds.
+    Expired jobs are skipped when dequeued and abandoned between stages (latents,
+    synthesis), but a synthesis already under way runs to completion: a timeout
+    does not free the worker until then.
+    Output files are only written under `output_dir` (default: the working
+    directory); relative paths are taken from there, and paths outside it are
+    rejected (400), so clients can't overwrite arbitrary files.
+    Any object with the Synthesizer interface can be passed in, e.g. a stub for tests.
+    Per-stage timings are kept in a histogram registry and served at /metrics.
+    """
+
+    def __init__(self, manager, synthesizer, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 max_queue: int = 8, timeout: float = 120.0, metrics=None, output_dir: Optional[str] = None):
+        from src import tracing
+
+        self.manager = manager
+        self.synthesizer = synthesizer
+        self.timeout = timeout
+        self.output_dir = Path(output_dir or os.getcwd()).resolve()
+        self.metrics = tracing.add_sink(metrics or tracing.HistogramRegistry())
+        self.queue: "queue.Queue[SpeakJob]" = queue.Queue(maxsize=max_queue)
+        from http.server import ThreadingHTTPServer
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._worker = threading.Thread(target=self._work, daemon=True)
+
+    @property
+    def address(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def resolve_output(self, path: str) -> str:
+        """Absolute path for a requested output; raises ValueError unless it lies under output_dir."""
+        resolved = (self.output_dir / path).resolve()
+        if resolved == self.output_dir or self.output_dir not in resolved.parents:
+            raise ValueError(f"output must be a file under {self.output_dir}")
+        return str(resolved)
+
+    def submit(self, job: SpeakJob):
+        """Enqueue a job; raises queue.Full when the server is saturated."""
+        self.queue.put_nowait(job)
+
+    def start(self):
+        """Load the model and start the worker without blocking."""
+        self.synthesizer.load_model()
+        self._worker.start()
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def serve_forever(self):
+        """Load the model, then serve until interrupted."""
+        self.synthesizer.load_model()
+        self._worker.start()
+        print(f"✓ Synthesis server listening on {self.address} (queue size {self.queue.maxsize})")
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\nShutting down...")
+        finally:
+            self.httpd.server_close()
+
+    def shutdown(self):
+        from src import tracing
+
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        tracing.remove_sink(self.metrics)
+
+    def _work(self):
+        while True:
+            job = self.queue.get()
+            try:
+                job.check()
+                job.result = self._run(job)
+            except TimeoutError:
+                job.timed_out = True
+            except Exception as e:
+                job.error = str(e)
+            finally:
+                job.done.set()
+                self.queue.task_done()
+
+    def _run(self, job: SpeakJob) -> Union[str, bytes]:
+        from src.encode import format_for_path
+
+        ref_audio = self.manager.get_reference_audio(job.voice)
+        if not ref_audio:
+            raise ValueError(f"Voice '{job.voice}' has no reference audio")
+        synthesizer = self.synthesizer.using(self.manager.get_base_model(job.voice))
+        if job.output_path is None:
+            # Straight back to the client, encoded in memory
+            latents = self.manager.get_conditioning_latents(job.voice, synthesizer)
+            job.check()
+            return synthesizer.synthesize_bytes(job.text, ref_audio, job.language, latents, job.seed, job.format)
+        latents = None
+        Path(job.output_path).parent.mkdir(parents=True, exist_ok=True)  # Under output_dir, checked on submit
+        fmt = job.format or format_for_path(job.output_path)
+        ref_hash = self.manager.get_reference_hash(job.voice)
+        if not synthesizer.is_cached(job.text, ref_audio, job.language, job.seed, fmt, ref_hash):
+            latents = self.manager.get_conditioning_latents(job.voice, synthesizer)
+            job.check()
+        return synthesizer.speak(
+            text=job.text,
+            output_path=job.output_path,
+            reference_audio_path=ref_audio,
+            language=job.language,
+            latents=latents,
+            seed=job.seed,
+            format=fmt,
+            reference_hash=ref_hash
+        )
+
+    def _make_handler(self):
+        from http.server import BaseHTTPRequestHandler
+        from src.encode import FORMATS, MIME_TYPES
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status: int, body: Dict, headers: Optional[Dict] = None):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/metrics":
+                    data = server.metrics.to_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+                if self.path != "/health":
+                    return self._reply(404, {"error": "not found"})
+                self._reply(200, {
+                    "status": "ok",
+                    "model": server.synthesizer.model_id,
+                    "capabilities": server.synthesizer.capabilities.to_dict(),
+                    "queued": server.queue.qsize(),
+                    "queue_size": server.queue.maxsize,
+                    "output_dir": str(server.output_dir),
+                    "loaded_models": server.synthesizer.models.usage(),
+                })
+
+            def do_POST(self):
+                if self.path != "/speak":
+                    return self._reply(404, {"error": "not found"})
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                    fmt = payload.get("format")
+                    if fmt is not None and fmt not in FORMATS:
+                        raise ValueError(f"unknown format '{fmt}'")
+                    # A format without an output path asks for the audio in the response body
+                    output = payload.get("output", None if fmt else "output.wav")
+                    if output is not None:
+                        output = server.resolve_output(output)
+                    job = SpeakJob(
+                        voice=payload["voice"],
+                        text=payload["text"],
+                        language=payload.get("language", "en"),
+                        output_path=output,
+                        seed=None if payload.get("seed") is None else int(payload["seed"]),
+                        format=fmt,
+                    )
+                    timeout = float(payload.get("timeout", server.timeout))
+                    job.deadline = time.monotonic() + timeout
+                except (ValueError, KeyError, TypeError) as e:
+                    return self._reply(400, {"error": f"bad request: {e}"})
+
+                try:
+                    server.submit(job)
+                except queue.Full:
+                    return self._reply(503, {"error": "server busy, try again later"}, {"Retry-After": "1"})
+
+                if not job.done.wait(timeout) or job.timed_out:
+                    # The worker skips it if still queued and abandons it at the next stage if running
+                    job.cancelled = True
+                    return self._reply(504, {"error": f"timed out after {timeout:g}s"})
+                if job.error:
+                    return self._reply(500, {"error": job.error})
+                if isinstance(job.result, bytes):
+                    self.send_response(200)
+                    self.send_header("Content-Type", MIME_TYPES[job.format])
+                    self.send_header("Content-Length", str(len(job.result)))
+                    self.end_headers()
+                    self.wfile.write(job.result)
+                    return
+                self._reply(200, {"output": job.result})
+
+        return Handler
+
+
+class SynthesisClient:
+    """Thin client that forwards speak requests to a running SynthesisServer."""
+
+    def __init__(self, url: str = DEFAULT_URL):
+        self.url = url.rstrip("/")
+
+    def health(self, timeout: float = 0.5) -> Optional[Dict]:
+        """The server's /health report, or None if it isn't reachable."""
+        import urllib.error
+        import urllib.request
+
+        try:
+            with urllib.request.urlopen(f"{self.url}/health", timeout=timeout) as resp:
+                return json.loads(resp.read()) if resp.status == 200 else None
+        except (urllib.error.URLError, OSError, ValueError):
+            return None
+
+    def is_available(self, timeout: float = 0.5) -> bool:
+        return self.health(timeout) is not None
+
+    def can_write(self, output_path: str, timeout: float = 0.5) -> bool:
+        """True if the server may write output_path itself (it lies under the server's output directory)."""
+        health = self.health(timeout) or {}
+        root = health.get("output_dir")
+        if not root:
+            return False
+        path = Path(os.path.abspath(output_path))
+        return Path(root) in path.parents
+
+    def speak(self, voice: str, text: str, output_path: str, language: str = "en",
+              seed: Optional[int] = None, timeout: Optional[float] = None, format: Optional[str] = None) -> str:
+        payload = {
+            "voice": voice,
+            "text": text,
+            "language": language,
+            # The server resolves paths against its own working directory
+            "output": os.path.abspath(output_path),
+        }
+        if format is not None:
+            payload["format"] = format
+        return json.loads(self._post(payload, seed, timeout))["output"]
+
+    def speak_bytes(self, voice: str, text: str, format: str = "wav", language: str = "en",
+                    seed: Optional[int] = None, timeout: Optional[float] = None) -> bytes:
+        """Synthesize on the server and receive the encoded audio, with no file on either side."""
+        payload = {"voice": voice, "text": text, "language": language, "format": format}
+        return self._post(payload, seed, timeout)
+
+    def _post(self, payload: Dict, seed: Optional[int], timeout: Optional[float]) -> bytes:
+        import urllib.error
+        import urllib.request
+
+        if seed is not None:
+            payload["seed"] = seed
+        if timeout is not None:
+            payload["timeout"] = timeout
+        request = urllib.request.Request(
+            f"{self.url}/speak",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            # Leave headroom over the server-side timeout so the server reports it
+            with urllib.request.urlopen(request, timeout=(timeout or 600) + 5) as resp:
+                return resp.read()
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            raise ServerError(message, e.code)
+        except (urllib.error.URLError, OSError) as e:
+            raise ServerError(str(e))
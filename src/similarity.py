@@ -0,0 +1,183 @@
+import json
+import os
+import re
+import numpy as np
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: updates from concurrent processes are not serialised
+    fcntl = None
+
+
+class SimilarityIndex:
+    """
+    Speaker embeddings of every voice, for one model, as a memory-mapped matrix.
+
+    Rows are L2-normalised float32 vectors in '<model>.f32'; '<model>.json' holds
+    the voice id and reference hash of each row. Cosine search is then a single
+    matrix-vector product over the mapped file, so tens of thousands of voices
+    are searched in milliseconds without loading the matrix into the heap.
+    Updates touch one row (in place, appended, or swapped with the last row on
+    removal) under a file lock, so pool workers can update it concurrently.
+    """
+
+    def __init__(self, directory: str, model_id: str):
+        self.directory = Path(directory)
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_id)
+        self.matrix_path = self.directory / f"{slug}.f32"
+        self.ids_path = self.directory / f"{slug}.json"
+        self.lock_path = self.directory / f"{slug}.lock"
+        self.model_id = model_id
+        self._stamp = None
+        self.dim = 0
+        self.ids: List[str] = []
+        self.hashes: Dict[str, str] = {}
+        self._rows: Dict[str, int] = {}
+        self._matrix = None
+
+    def _reload(self):
+        """Re-read the ids file if another process changed it since we last looked."""
+        try:
+            st = self.ids_path.stat()
+        except FileNotFoundError:
+            stamp, state = None, {"dim": 0, "ids": [], "hashes": {}}
+        else:
+            stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+            if stamp == self._stamp:
+                return
+            with open(self.ids_path, 'r') as f:
+                state = json.load(f)
+        self._stamp = stamp
+        self.dim = state["dim"]
+        self.ids = state["ids"]
+        self.hashes = state["hashes"]
+        self._rows = {voice_id: row for row, voice_id in enumerate(self.ids)}
+        self._matrix = None
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The (voices x dim) embedding matrix, mapped read-only."""
+        self._reload()
+        if self._matrix is None:
+            if not self.ids:
+                self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+            else:
+                self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode='r', shape=(len(self.ids), self.dim))
+        return self._matrix
+
+    def voices(self) -> List[str]:
+        """Ids of the indexed voices, in row order."""
+        self._reload()
+        return list(self.ids)
+
+    def __len__(self) -> int:
+        self._reload()
+        return len(self.ids)
+
+    def __contains__(self, voice_id: str) -> bool:
+        self._reload()
+        return voice_id in self._rows
+
+    def hash_of(self, voice_id: str) -> Optional[str]:
+        """Reference hash the voice's row was computed from (None if not indexed)."""
+        self._reload()
+        return self.hashes.get(voice_id)
+
+    def vector(self, voice_id: str) -> Optional[np.ndarray]:
+        self._reload()
+        row = self._rows.get(voice_id)
+        return None if row is None else np.array(self.matrix[row])
+
+    @contextmanager
+    def _locked(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'a') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._reload()
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _save_ids(self):
+        # Rows beyond len(ids) left by an interrupted update are ignored, then overwritten
+        tmp_path = f"{self.ids_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"model": self.model_id, "dim": self.dim, "ids": self.ids, "hashes": self.hashes}, f)
+        os.replace(tmp_path, self.ids_path)
+        self._stamp = None
+        self._matrix = None
+
+    def upsert(self, voice_id: str, embedding: np.ndarray, reference_hash: Optional[str] = None):
+        """Add or replace a voice's embedding."""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        vector = vector / (np.linalg.norm(vector) + 1e-12)
+        with self._locked():
+            if self.ids and len(vector) != self.dim:
+                raise ValueError(f"Embedding has {len(vector)} dimensions, index has {self.dim}")
+            self.dim = len(vector)
+            row = self._rows.get(voice_id, len(self.ids))
+            mode = 'r+b' if self.matrix_path.exists() else 'wb'
+            with open(self.matrix_path, mode) as f:
+                f.seek(row * self.dim * 4)
+                f.write(vector.tobytes())
+            if row == len(self.ids):
+                self.ids.append(voice_id)
+            self.hashes[voice_id] = reference_hash
+            self._save_ids()
+
+    def remove(self, voice_id: str) -> bool:
+        """Drop a voice's row, moving the last row into its place."""
+        with self._locked():
+            row = self._rows.get(voice_id)
+            if row is None:
+                return False
+            last = len(self.ids) - 1
+            row_bytes = self.dim * 4
+            with open(self.matrix_path, 'r+b') as f:
+                if row != last:
+                    f.seek(last * row_bytes)
+                    tail = f.read(row_bytes)
+                    f.seek(row * row_bytes)
+                    f.write(tail)
+                    self.ids[row] = self.ids[last]
+                f.truncate(last * row_bytes)
+            self.ids.pop()
+            self.hashes.pop(voice_id, None)
+            self._save_ids()
+            return True
+
+    def search(self, embedding: np.ndarray, k: int = 5, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """The k most similar voices as (voice_id, cosine similarity), best first."""
+        matrix = self.matrix
+        if not len(matrix):
+            return []
+        query = np.asarray(embedding, dtype=np.float32).ravel()
+        if len(query) != self.dim:
+            raise ValueError(f"Query has {len(query)} dimensions, index has {self.dim}")
+        scores = matrix @ (query / (np.linalg.norm(query) + 1e-12))
+        if exclude in self._rows:
+            scores[self._rows[exclude]] = -np.inf
+        k = min(k, len(scores) - (exclude in self._rows))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], float(scores[i])) for i in top]
+
+
+def remove_voice(directory: str, voice_id: str):
+    """Drop a voice from every model's index (e.g. after its reference changed)."""
+    for ids_path in Path(directory).glob("*.json"):
+        try:
+            with open(ids_path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if voice_id in state.get("hashes", {}):
+            SimilarityIndex(directory, state["model"]).remove(voice_id)
@@ -1,57 +1,215 @@
 
-from TTS.api import TTS
-import torch
 import os
+import time
+import wave
+import numpy as np
+from typing import Dict, Iterator, Optional
+from src import encode, tracing
+from src.backends import DEFAULT_MODEL, Backend, Capabilities, resolve
+from src.cache import SynthesisCache
+from src.models import MODELS, ModelRegistry
+from src.utils import file_hash
 
 class Synthesizer:
-    def __init__(self, model_name: str = "tts_models/multilingual/multi-dataset/xtts_v2"):
-        self.model_name = model_name
-        self.tts = None
-    
+    """
+    Speaks through a pluggable backend (see src/backends) and adds what every
+    engine shares: the output cache, encoding, streaming stats and routing
+    voices to the backend named by their base_model. Backends come from the
+    process-wide model registry (src.models), so synthesizers for the same
+    model share one loaded copy.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, cache: Optional[SynthesisCache] = None,
+                 quantize: bool = False, threads: Optional[int] = None, interop_threads: Optional[int] = None,
+                 device: Optional[str] = None, backend: Optional[Backend] = None,
+                 models: Optional[ModelRegistry] = None):
+        self.model_name = model_name or DEFAULT_MODEL
+        self.cache = cache
+        self.options = {"quantize": quantize, "threads": threads, "interop_threads": interop_threads, "device": device}
+        self.models = models or MODELS
+        self.backend = backend or self.models.backend(model_name, **self.options)
+        self._siblings: Dict = {}
+
+    def using(self, base_model: Optional[str]) -> "Synthesizer":
+        """
+        The synthesizer for another base model (e.g. a voice's), sharing this one's
+        cache and options. Each backend is created once and reused.
+        """
+        key = resolve(base_model)
+        if key == resolve(self.model_name):
+            return self
+        if key not in self._siblings:
+            self._siblings[key] = Synthesizer(base_model, cache=self.cache, models=self.models, **self.options)
+        return self._siblings[key]
+
+    @property
+    def model_id(self) -> str:
+        """Model name plus variant; caches key on this."""
+        return self.backend.model_id
+
+    @property
+    def capabilities(self) -> Capabilities:
+        return self.backend.capabilities
+
     def load_model(self):
         """Lazy load the model to save resources if just managing files."""
-        if not self.tts:
-            print(f"⏳ Loading TTS model: {self.model_name}...")
-            
-            # Initialize with gpu=False first to avoid CUDA assertion
-            self.tts = TTS(self.model_name, progress_bar=True, gpu=False)
-            
-            # Manually move to MPS if available
-            if torch.backends.mps.is_available():
-                print("✓ Using MPS (Apple Silicon) acceleration")
-                self.tts.to("mps")
-            
-    def speak(self, text: str, output_path: str, reference_audio_path: str = None, language: str = "en"):
-        """Synthesize speech to a file."""
+        self.models.load(self.backend)
+
+    def compute_latents(self, reference_audio_path: str) -> Dict:
+        """Encode a reference clip into the backend's conditioning latents."""
         self.load_model()
-        
-        # Generation parameters for better quality
-        # temperature: Lower = more stable/conservative (less hallucinations)
-        # repetition_penalty: Higher = avoid looping
-        # speed: 1.0 is standard
-        config = {
-            "temperature": 0.7,
-            "repetition_penalty": 1.2,
-            "speed": 0.9, 
-            "do_sample": True
-        }
-        
-        if reference_audio_path and os.path.exists(reference_audio_path):
+        return self.backend.compute_latents(reference_audio_path)
+
+    def save_latents(self, latents: Dict, path: str):
+        """Persist conditioning latents (plus any cache keys) to disk."""
+        self.backend.save_latents(latents, path)
+
+    def load_latents(self, path: str) -> Optional[Dict]:
+        """Load conditioning latents saved by save_latents, or None if unreadable."""
+        return self.backend.load_latents(path)
+
+    @property
+    def sample_rate(self) -> int:
+        """Native output sample rate of the backend."""
+        return self.capabilities.sample_rate
+
+    def _check_language(self, language: str):
+        if not self.capabilities.supports_language(language):
+            raise ValueError(f"{self.model_id} does not support language '{language}'")
+
+    def speak_stream(self, text: str, reference_audio_path: str = None, language: str = "en",
+                     latents: Optional[Dict] = None, stream_chunk_size: int = 20) -> Iterator[np.ndarray]:
+        """
+        Synthesize speech incrementally, yielding int16 PCM chunks as the backend produces them
+        (a single chunk for backends that can't stream).
+        Timing of the last run is kept in `self.stream_stats`.
+        """
+        self.load_model()
+        self._check_language(language)
+        if not latents and self.capabilities.cloning:
+            if not (reference_audio_path and os.path.exists(reference_audio_path)):
+                raise ValueError("Streaming synthesis needs reference audio or cached latents")
+            latents = self.compute_latents(reference_audio_path)
+
+        start = time.perf_counter()
+        self.stream_stats = {"time_to_first_chunk": None, "total_time": 0.0, "audio_seconds": 0.0}
+
+        samples = 0
+        for chunk in self.backend.stream(text, language, latents, chunk_size=stream_chunk_size):
+            if self.stream_stats["time_to_first_chunk"] is None:
+                self.stream_stats["time_to_first_chunk"] = time.perf_counter() - start
+            pcm = (np.clip(chunk, -1.0, 1.0) * 32767).astype(np.int16)
+            samples += len(pcm)
+            yield pcm
+
+        self.stream_stats["total_time"] = time.perf_counter() - start
+        self.stream_stats["audio_seconds"] = samples / self.sample_rate
+        # Spans can't wrap a generator (the caller runs between chunks), so report the totals
+        if self.stream_stats["time_to_first_chunk"] is not None:
+            tracing.emit("stream.first_chunk", self.stream_stats["time_to_first_chunk"])
+        tracing.emit("stream.total", self.stream_stats["total_time"], audio_seconds=self.stream_stats["audio_seconds"])
+
+    def _cache_key(self, text: str, reference_audio_path: Optional[str], language: str,
+                   seed: Optional[int], format: str = "wav", reference_hash: Optional[str] = None) -> Optional[str]:
+        """
+        Output cache key, or None when results are not reproducible (no seed) or caching is off.
+        Pass the reference's hash when it's known (e.g. from the voice registry) to skip re-hashing the file.
+        """
+        if self.cache is None or seed is None:
+            return None
+        if reference_hash is None:
+            has_ref = reference_audio_path and os.path.exists(reference_audio_path)
+            reference_hash = file_hash(reference_audio_path) if has_ref else "default-speaker"
+        # WAV keys predate the other formats; leave them unchanged so existing entries stay valid
+        config = self.backend.config if format == "wav" else dict(self.backend.config, format=format)
+        return SynthesisCache.make_key(self.model_id, reference_hash, text, language, config, seed)
+
+    def is_cached(self, text: str, reference_audio_path: str = None, language: str = "en",
+                  seed: Optional[int] = None, format: str = "wav", reference_hash: Optional[str] = None) -> bool:
+        """True if speak() with these arguments would be served from the output cache."""
+        key = self._cache_key(text, reference_audio_path, language, seed, format, reference_hash)
+        return key is not None and self.cache.contains(key, format)
+
+    def synthesize(self, text: str, reference_audio_path: str = None, language: str = "en",
+                   latents: Optional[Dict] = None, seed: Optional[int] = None, normalize: bool = True) -> np.ndarray:
+        """
+        Render text to a mono float32 array at `sample_rate`, without touching disk or the cache.
+        normalize=False skips the backend's post-processing, for callers that stitch pieces first.
+        """
+        self.load_model()
+        self._check_language(language)
+        if seed is not None:
+            self.backend.seed(seed)
+        has_ref = reference_audio_path and os.path.exists(reference_audio_path)
+        wav = self.backend.synthesize(text, language, latents=latents,
+                                      reference_audio_path=reference_audio_path if has_ref else None)
+        return self.backend.postprocess(wav) if normalize else wav
+
+    def synthesize_bytes(self, text: str, reference_audio_path: str = None, language: str = "en",
+                         latents: Optional[Dict] = None, seed: Optional[int] = None, format: str = "wav") -> bytes:
+        """Render text straight to an in-memory buffer encoded as wav, flac, opus or raw pcm."""
+        wav = self.synthesize(text, reference_audio_path, language, latents, seed)
+        with tracing.span("output.encode", format=format):
+            return encode.encode(wav, self.sample_rate, format)
+
+    def speak(self, text: str, output_path: str, reference_audio_path: str = None, language: str = "en",
+              latents: Optional[Dict] = None, seed: Optional[int] = None, format: Optional[str] = None,
+              reference_hash: Optional[str] = None):
+        """
+        Synthesize speech to a file, or to stdout when output_path is '-'.
+        The format defaults to the one the extension implies (.wav, .flac, .opus/.ogg, .pcm/.raw).
+        With a seed, sampling is reproducible and results go through the output cache;
+        a cache hit returns without loading the model. reference_hash (else the one
+        stored in the latents) saves hashing the reference file for the cache key.
+        """
+        format = format or encode.format_for_path(output_path)
+        if reference_hash is None and latents:
+            reference_hash = latents.get("reference_hash")
+        with tracing.span("speak", chars=len(text), language=language):
+            return self._speak(text, output_path, reference_audio_path, language, latents, seed, format, reference_hash)
+
+    def _speak(self, text: str, output_path: str, reference_audio_path: Optional[str], language: str,
+               latents: Optional[Dict], seed: Optional[int], format: str, reference_hash: Optional[str]):
+        # The cache copies files in and out, which stdout can't take part in
+        cacheable = output_path != "-"
+        with tracing.span("cache.fetch"):
+            cache_key = cacheable and self._cache_key(text, reference_audio_path, language, seed, format, reference_hash)
+            hit = cache_key and self.cache.fetch(cache_key, output_path, format)
+        if hit:
+            print("♻️  Served from synthesis cache")
+            return output_path
+
+        has_ref = reference_audio_path and os.path.exists(reference_audio_path)
+        if latents:
+            # Precomputed conditioning: skip reloading and re-encoding the reference
+            print("🗣️ Synthesizing with cached voice latents")
+        elif has_ref and self.capabilities.cloning:
             print(f"🗣️ Synthesizing with reference: {os.path.basename(reference_audio_path)}")
-            # XTTS specific params can be passed here
-            self.tts.tts_to_file(
-                text=text,
-                file_path=output_path,
-                speaker_wav=reference_audio_path,
-                language=language,
-                **config
-            )
-        else:
+        elif self.capabilities.cloning:
             print("ℹ️ No reference audio provided, using default/random speaker.")
-            self.tts.tts_to_file(
-                text=text,
-                file_path=output_path,
-                language=language
-            )
+        else:
+            print(f"ℹ️ {self.model_id} cannot clone voices, using its built-in speaker.")
+        wav = self.synthesize(text, reference_audio_path, language, latents, seed)
+        with tracing.span("output.write"):
+            encode.write(wav, self.sample_rate, output_path, format)
+
+        if cache_key:
+            with tracing.span("cache.store"):
+                self.cache.store(cache_key, output_path, format)
         
         return output_path
+
+
+def write_wav_stream(chunks: Iterator[np.ndarray], output_path: str, sample_rate: int) -> str:
+    """
+    Write int16 PCM chunks to a WAV file as they arrive.
+    The header is patched after every chunk, so the file is playable while still growing.
+    """
+    with open(output_path, "wb") as f, wave.open(f, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        for chunk in chunks:
+            wav.writeframes(chunk.tobytes())
+            f.flush()
+    return output_path
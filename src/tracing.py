@@ -0,0 +1,235 @@
+"""
+Per-stage timing spans with pluggable sinks.
+
+    with tracing.span("conditioning", voice="alice"):
+        ...
+
+With no sinks installed (the default), span() returns a shared no-op context
+manager and costs one list check, so instrumentation can stay in hot paths.
+Installing a sink turns on timing everywhere at once. Sinks get each finished
+span as a dict and must be thread-safe.
+"""
+import functools
+import json
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, TextIO
+
+_sinks: List = []
+_local = threading.local()
+
+# Prometheus-style upper bounds in seconds, sized for stages from file lookups to full renders
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class _NoopSpan:
+    duration = 0.0
+    children: Dict[str, float] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """A timed stage; nested spans record the enclosing span as their parent."""
+
+    def __init__(self, name: str, attrs: Dict):
+        self.name = name
+        self.attrs = attrs
+        self.duration = 0.0
+        self.children: Dict[str, float] = {}   # Total seconds spent in each direct child stage
+
+    def set(self, **attrs):
+        """Attach attributes discovered while the span runs (e.g. audio duration)."""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = _stack()
+        self._parent = stack[-1] if stack else None
+        self.parent = self._parent.name if self._parent else None
+        stack.append(self)
+        self.wall_start = time.time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = self.duration = time.perf_counter() - self.start
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        if self._parent is not None:
+            self._parent.children[self.name] = self._parent.children.get(self.name, 0.0) + duration
+        emit(self.name, duration, parent=self.parent, start=self.wall_start,
+             error=exc_type.__name__ if exc_type else None, **self.attrs)
+        return False
+
+
+def _stack() -> List[Span]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def enabled() -> bool:
+    return bool(_sinks)
+
+
+def span(name: str, **attrs):
+    """Time the enclosed block as stage `name` (a no-op unless a sink is installed)."""
+    if not _sinks:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def traced(name: str):
+    """Decorator form of span() for timing a whole function or method."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def emit(name: str, duration: float, parent: Optional[str] = None, start: Optional[float] = None,
+         error: Optional[str] = None, **attrs):
+    """Report a stage timed elsewhere (e.g. one derived from two other spans)."""
+    if not _sinks:
+        return
+    record = {
+        "span": name,
+        "duration": duration,
+        "start": start if start is not None else time.time() - duration,
+        "parent": parent if parent is not None else (_stack()[-1].name if _stack() else None),
+        "thread": threading.current_thread().name,
+    }
+    if error:
+        record["error"] = error
+    if attrs:
+        record["attrs"] = attrs
+    for sink in list(_sinks):
+        sink.record(record)
+
+
+def add_sink(sink):
+    if sink not in _sinks:
+        _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+def clear_sinks():
+    del _sinks[:]
+
+
+def instrument_module(module, name: str):
+    """
+    Time every forward() of a torch module as span `name` via forward hooks.
+    Lets stages buried inside a library call (e.g. the XTTS vocoder) be timed
+    without reimplementing the call. The hooks check for sinks first.
+    """
+    def before(mod, inputs):
+        if _sinks:
+            mod._trace_span = Span(name, {}).__enter__()
+
+    def after(mod, inputs, output):
+        current = getattr(mod, "_trace_span", None)
+        if current is not None:
+            mod._trace_span = None
+            current.__exit__(None, None, None)
+
+    module.register_forward_pre_hook(before)
+    module.register_forward_hook(after)
+
+
+class JsonLogSink:
+    """Writes each span as one JSON line (to stderr by default, or to a file)."""
+
+    def __init__(self, stream: Optional[TextIO] = None, path: Optional[str] = None):
+        self._own = path is not None
+        self.stream = open(path, 'a', encoding='utf-8') if path else (stream or sys.stderr)
+        self._lock = threading.Lock()
+
+    def record(self, record: Dict):
+        line = json.dumps(dict(record, duration_ms=round(record["duration"] * 1000, 3)), default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def close(self):
+        if self._own:
+            self.stream.close()
+
+
+class HistogramRegistry:
+    """In-process duration histograms per stage, exportable in Prometheus text format."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 metric: str = "voice_stage_duration_seconds"):
+        self.buckets = tuple(sorted(buckets))
+        self.metric = metric
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict] = {}
+
+    def record(self, record: Dict):
+        duration = record["duration"]
+        with self._lock:
+            stage = self._stages.get(record["span"])
+            if stage is None:
+                stage = self._stages[record["span"]] = {"count": 0, "sum": 0.0, "max": 0.0,
+                                                        "buckets": [0] * len(self.buckets)}
+            stage["count"] += 1
+            stage["sum"] += duration
+            stage["max"] = max(stage["max"], duration)
+            for i, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    stage["buckets"][i] += 1
+                    break
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Per-stage count, total, mean and max seconds."""
+        with self._lock:
+            return {
+                name: {"count": s["count"], "sum": s["sum"], "mean": s["sum"] / s["count"], "max": s["max"]}
+                for name, s in self._stages.items()
+            }
+
+    def to_prometheus(self) -> str:
+        lines = [
+            f"# HELP {self.metric} Time spent per pipeline stage.",
+            f"# TYPE {self.metric} histogram",
+        ]
+        with self._lock:
+            for name in sorted(self._stages):
+                stage = self._stages[name]
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                cumulative = 0
+                for bound, count in zip(self.buckets, stage["buckets"]):
+                    cumulative += count
+                    lines.append(f'{self.metric}_bucket{{stage="{label}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'{self.metric}_bucket{{stage="{label}",le="+Inf"}} {stage["count"]}')
+                lines.append(f'{self.metric}_sum{{stage="{label}"}} {stage["sum"]:.6f}')
+                lines.append(f'{self.metric}_count{{stage="{label}"}} {stage["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
@@ -0,0 +1,70 @@
+import hashlib
+import os
+import struct
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(Path(path), 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def append_wav_data(path: str, data: bytes) -> bool:
+    """
+    Append raw sample bytes to a WAV file in place and patch its RIFF/data sizes
+    (and the 'fact' sample count that float WAVs carry).
+    Only works when 'data' is the last chunk; returns False otherwise so the
+    caller can fall back to rewriting the file.
+    """
+    with open(path, 'r+b') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            return False
+        file_size = f.seek(0, 2)
+        offset = 12
+        block_align = 0
+        fact_offset = None
+        while offset + 8 <= file_size:
+            f.seek(offset)
+            chunk_id, chunk_size = struct.unpack('<4sI', f.read(8))
+            if chunk_id == b'fmt ':
+                block_align = struct.unpack('<12xH', f.read(14))[0]
+            elif chunk_id == b'fact':
+                fact_offset = offset + 8
+            elif chunk_id == b'data':
+                if offset + 8 + chunk_size != file_size or not block_align or len(data) % block_align:
+                    return False
+                f.seek(0, 2)
+                f.write(data)
+                f.seek(offset + 4)
+                f.write(struct.pack('<I', chunk_size + len(data)))
+                f.seek(4)
+                f.write(struct.pack('<I', file_size + len(data) - 8))
+                if fact_offset is not None:
+                    f.seek(fact_offset)
+                    f.write(struct.pack('<I', (chunk_size + len(data)) // block_align))
+                return True
+            offset += 8 + chunk_size + (chunk_size & 1)
+    return False
+
+
+def parallel_map(fn: Callable, *iterables: Iterable, max_workers: Optional[int] = None) -> List:
+    """
+    Like map(fn, *iterables), but across a process pool. Runs inline when there is
+    at most one item, since a pool costs more to start than one clip takes to process,
+    or when max_workers is 1 (e.g. inside a worker that is itself one of a pool).
+    fn must be a module-level function so it can be pickled.
+    """
+    columns = [list(it) for it in iterables]
+    count = min(len(c) for c in columns) if columns else 0
+    if count <= 1 or max_workers == 1:
+        return list(map(fn, *columns))
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(count, max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, *columns))
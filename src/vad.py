@@ -0,0 +1,124 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+FRAME_MS = 20           # Analysis frame length
+CHUNK_FRAMES = 8192     # Frames converted to float at a time (~2.7 min at 20 ms)
+CLIP_LEVEL = 0.999      # |sample| at or above this counts as clipped
+
+
+def to_float(audio: np.ndarray) -> np.ndarray:
+    """Convert PCM samples of any WAV dtype to float32 in [-1, 1], downmixing to mono."""
+    if audio.dtype == np.uint8:
+        x = (audio.astype(np.float32) - 128.0) / 128.0
+    elif np.issubdtype(audio.dtype, np.integer):
+        x = audio.astype(np.float32) / float(-np.iinfo(audio.dtype).min)
+    else:
+        x = audio.astype(np.float32, copy=False)
+    if x.ndim > 1:
+        x = x.mean(axis=1)
+    return x
+
+
+def frame_stats(audio: np.ndarray, frame_length: int, chunk_frames: int = CHUNK_FRAMES) -> Tuple[np.ndarray, int]:
+    """
+    RMS energy per non-overlapping frame, plus the number of clipped samples.
+    The signal is read in fixed-size chunks, so a memory-mapped input is never
+    fully materialised; only one float value per frame is kept.
+    """
+    n_frames = -(-len(audio) // frame_length)
+    rms = np.empty(n_frames, dtype=np.float32)
+    clipped = 0
+    step = chunk_frames * frame_length
+    for offset in range(0, len(audio), step):
+        x = to_float(audio[offset:offset + step])
+        clipped += int(np.count_nonzero(np.abs(x) >= CLIP_LEVEL))
+        pad = -len(x) % frame_length
+        if pad:
+            x = np.pad(x, (0, pad))
+        frames = x.reshape(-1, frame_length)
+        first = offset // frame_length
+        rms[first:first + len(frames)] = np.sqrt(np.mean(frames * frames, axis=1))
+    return rms, clipped
+
+
+def speech_mask(rms: np.ndarray, floor_ratio_db: float = 12.0, peak_ratio_db: float = -40.0) -> np.ndarray:
+    """
+    Frame-level voice activity.
+    A frame is speech if it is clearly above the estimated noise floor (10th percentile
+    of frame energy) and within `peak_ratio_db` of the loudest frames. The 99th
+    percentile is used as the peak so an isolated click cannot raise the bar.
+    """
+    if not len(rms):
+        return np.zeros(0, dtype=bool)
+    noise_floor, peak = np.percentile(rms, [10, 99])
+    threshold = max(noise_floor * 10 ** (floor_ratio_db / 20), peak * 10 ** (peak_ratio_db / 20), 1e-4)
+    return rms > threshold
+
+
+def speech_segments(mask: np.ndarray, min_speech_frames: int = 3, max_pause_frames: int = 25,
+                    pad_frames: int = 5) -> List[Tuple[int, int]]:
+    """
+    Turn a frame mask into (start, end) frame ranges of speech.
+    Bursts shorter than `min_speech_frames` (clicks, pops) are dropped, gaps up to
+    `max_pause_frames` are bridged, and longer interior pauses are cut down to
+    the padding left on either side of each segment.
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    runs = edges.reshape(-1, 2)
+    runs = runs[(runs[:, 1] - runs[:, 0]) >= min_speech_frames]
+    if not len(runs):
+        return []
+
+    segments = [[int(runs[0, 0]), int(runs[0, 1])]]
+    for start, end in runs[1:]:
+        if start - segments[-1][1] <= max_pause_frames:
+            segments[-1][1] = int(end)
+        else:
+            segments.append([int(start), int(end)])
+
+    n = len(mask)
+    return [(max(0, s - pad_frames), min(n, e + pad_frames)) for s, e in segments]
+
+
+def quality_score(snr_db: float, speech_ratio: float, clipping: float) -> float:
+    """
+    Rank a clip as reference material, 0 (useless) to 1 (clean).
+    SNR dominates; clipping as low as 0.1% of samples zeroes its share.
+    """
+    snr = min(max(snr_db, 0.0), 40.0) / 40.0
+    clean = 1.0 - min(clipping * 1000.0, 1.0)
+    return 0.5 * snr + 0.3 * speech_ratio + 0.2 * clean
+
+
+def analyse(audio: np.ndarray, sample_rate: int, max_pause: float = 0.5) -> Dict:
+    """
+    Find the speech in a clip and estimate its quality.
+    Returns sample ranges to keep, the clip's speech/silence breakdown, an SNR
+    estimate (speech energy over the noise floor), the clipped-sample fraction
+    and an overall quality score.
+    """
+    frame_length = max(1, int(sample_rate * FRAME_MS / 1000))
+    rms, clipped = frame_stats(audio, frame_length)
+    mask = speech_mask(rms)
+    segments = speech_segments(mask, max_pause_frames=int(max_pause * 1000 / FRAME_MS))
+
+    total = len(audio)
+    samples = [(s * frame_length, min(total, e * frame_length)) for s, e in segments]
+    kept = sum(e - s for s, e in samples)
+    speech_ratio = float(mask.mean()) if len(mask) else 0.0
+
+    noise = max(float(np.percentile(rms, 10)), 1e-5) if len(rms) else 1e-5
+    speech = float(rms[mask].mean()) if mask.any() else noise
+    snr_db = 20 * np.log10(max(speech, 1e-5) / noise)
+    clipping = clipped / float(total) if total else 0.0
+
+    return {
+        "segments": [list(seg) for seg in samples],
+        "duration": total / float(sample_rate),
+        "speech_seconds": kept / float(sample_rate),
+        "speech_ratio": speech_ratio,
+        "kept_ratio": kept / float(total) if total else 0.0,
+        "snr_db": float(snr_db),
+        "clipping": clipping,
+        "score": quality_score(float(snr_db), speech_ratio, clipping),
+    }
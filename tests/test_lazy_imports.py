@@ -0,0 +1,57 @@
+"""
+File-management commands must start without the heavy audio/ML stack.
+
+Each check runs in a fresh interpreter so modules imported by other tests
+(or by pytest itself) can't hide a regression.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("torch", "TTS", "sounddevice", "numpy")
+
+PROBE = """
+import json, runpy, sys
+heavy = json.loads(sys.argv[2])
+sys.argv = ["src.cli"] + json.loads(sys.argv[1])
+try:
+    runpy.run_module("src.cli", run_name="__main__")
+except SystemExit:
+    pass
+print("\\nLOADED=" + json.dumps(sorted(m for m in heavy if m in sys.modules)))
+"""
+
+
+def loaded_heavy_modules(args, cwd):
+    """Run `python -m src.cli <args>` in a fresh process and return the heavy modules it imported."""
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, json.dumps(args), json.dumps(list(HEAVY_MODULES))],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    line = [l for l in result.stdout.splitlines() if l.startswith("LOADED=")][-1]
+    return json.loads(line[len("LOADED="):])
+
+
+@pytest.mark.parametrize("args", [
+    ["list"],
+    ["new", "Lazy Voice", "--desc", "import check"],
+    ["--help"],
+])
+def test_file_commands_skip_heavy_imports(args, tmp_path):
+    assert loaded_heavy_modules(args, tmp_path) == []
+
+
+def test_importing_cli_skips_heavy_imports(tmp_path):
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    code = f"import sys, src.cli; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
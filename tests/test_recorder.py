@@ -0,0 +1,85 @@
+"""AudioRecorder fed synthetic audio through ArrayInput instead of a microphone."""
+import threading
+import wave
+
+import numpy as np
+import pytest
+
+from src.recorder import ArrayInput, AudioRecorder
+
+FS = 22050
+
+
+def noise(seconds, level=0.001, seed=0):
+    return (level * np.random.default_rng(seed).standard_normal(int(seconds * FS))).astype(np.float32)
+
+
+def speech(seconds, seed=1):
+    """A pitched, syllable-modulated tone over low noise: loud and bursty like voice."""
+    t = np.arange(int(seconds * FS)) / FS
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    return (0.3 * envelope * np.sin(2 * np.pi * 180 * t)).astype(np.float32) + noise(seconds, seed=seed)
+
+
+def wav_seconds(path):
+    with wave.open(str(path), "rb") as wav:
+        return wav.getnframes() / wav.getframerate()
+
+
+def record(signal, path, **kwargs):
+    recorder = AudioRecorder(FS, input_device=ArrayInput(signal))
+    kwargs.setdefault("duration_sec", len(signal) / FS + 1)
+    return recorder.record(output_path=str(path), **kwargs)
+
+
+def test_trim_drops_leading_and_trailing_silence(tmp_path):
+    out = tmp_path / "take.wav"
+    signal = np.concatenate([noise(1.0), speech(2.0), noise(1.5)])
+    assert record(signal, out)
+    # Speech plus at most the 0.2 s padding either side (and a block of VAD slack)
+    assert 1.9 <= wav_seconds(out) <= 2.6
+
+
+def test_no_trim_keeps_every_sample(tmp_path):
+    out = tmp_path / "take.wav"
+    signal = np.concatenate([noise(1.0), speech(2.0), noise(1.0)])
+    assert record(signal, out, trim=False)
+    with wave.open(str(out), "rb") as wav:
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    assert np.array_equal(samples, (np.clip(signal, -1.0, 1.0) * 32767).astype(np.int16))
+
+
+def test_auto_stop_ends_after_trailing_silence(tmp_path):
+    out = tmp_path / "take.wav"
+    signal = np.concatenate([noise(1.0), speech(2.0), noise(20.0)])
+    assert record(signal, out, stop_on_silence=1.0, trim=False)
+    # Stops about a second into the silence instead of recording all 23 s
+    assert 3.8 <= wav_seconds(out) <= 4.5
+
+
+def test_speech_from_the_first_block_is_kept(tmp_path):
+    out = tmp_path / "take.wav"
+    signal = np.concatenate([speech(4.0), noise(1.0)])
+    assert record(signal, out)
+    assert wav_seconds(out) >= 3.9
+
+
+def test_take_without_detected_speech_is_kept_untrimmed(tmp_path):
+    out = tmp_path / "take.wav"
+    signal = noise(3.0)
+    assert record(signal, out)
+    assert wav_seconds(out) == pytest.approx(3.0, abs=0.01)
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.parametrize("kwargs", [{"duration_sec": 2}, {"duration_sec": 60, "stop_on_silence": 0.5}])
+def test_stopping_before_the_input_ends_does_not_hang(tmp_path, kwargs):
+    signal = np.concatenate([noise(0.5), speech(1.0), noise(30.0)])
+    recorder = AudioRecorder(FS, input_device=ArrayInput(signal), buffer_seconds=0.5)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(
+        recorder.record(output_path=str(tmp_path / "take.wav"), **kwargs)), daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "record() hung waiting for the input to finish"
+    assert results == [True]
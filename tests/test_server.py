@@ -0,0 +1,121 @@
+"""SynthesisServer run in-process on the stub backend."""
+import threading
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from src.manager import VoiceManager
+from src.models import ModelRegistry
+from src.server import ServerError, SynthesisClient, SynthesisServer
+from src.synthesis import Synthesizer
+
+FS = 22050
+LONG_TEXT = "word " * 30    # About 10 s of stub audio, 2 s to render at rtf 0.2
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = VoiceManager(str(tmp_path / "voices"))
+    manager.create_voice("Alice")
+    metadata = manager._load_metadata("alice")
+    metadata["base_model"] = "stub"
+    manager._save_metadata("alice", metadata)
+    t = np.arange(3 * FS) / FS
+    clip = 0.3 * np.sin(2 * np.pi * 180 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+    with wave.open(str(tmp_path / "voices" / "alice" / "audio" / "clip.wav"), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(FS)
+        wav.writeframes((clip * 32767).astype(np.int16).tobytes())
+    assert manager.process_audio("Alice")
+    return manager
+
+
+@pytest.fixture
+def make_server(manager, tmp_path):
+    servers = []
+
+    def make(rtf: float = 0.0, max_queue: int = 8, timeout: float = 30.0):
+        synthesizer = Synthesizer("stub", models=ModelRegistry())
+        synthesizer.backend.rtf = rtf
+        server = SynthesisServer(manager, synthesizer, port=0, max_queue=max_queue, timeout=timeout,
+                                 output_dir=str(tmp_path / "out"))
+        server.start()
+        servers.append(server)
+        return server, SynthesisClient(server.address)
+
+    yield make
+    for server in servers:
+        server.shutdown()
+
+
+def in_background(fn):
+    """Run fn in a thread; returns the thread and a list that receives its result or exception."""
+    outcome = []
+
+    def run():
+        try:
+            outcome.append(fn())
+        except Exception as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, outcome
+
+
+def test_speak_writes_under_output_dir(make_server, tmp_path):
+    server, client = make_server()
+    assert client.health()["status"] == "ok"
+    output = client.speak("Alice", "Hello there.", str(tmp_path / "out" / "hello.wav"), seed=1)
+    assert output == str(tmp_path / "out" / "hello.wav")
+    with wave.open(output, "rb") as wav:
+        assert wav.getnframes() > 0
+
+
+def test_speak_bytes_returns_audio(make_server):
+    server, client = make_server()
+    audio = client.speak_bytes("Alice", "Hello there.", format="wav", seed=1)
+    assert audio[:4] == b"RIFF"
+
+
+@pytest.mark.parametrize("output", ["../escape.wav", "/tmp/elsewhere.wav"])
+def test_output_outside_output_dir_is_rejected(make_server, tmp_path, output):
+    server, client = make_server()
+    with pytest.raises(ServerError) as error:
+        client._post({"voice": "Alice", "text": "Hi.", "output": output}, None, None)
+    assert error.value.status == 400
+    assert not (tmp_path / "escape.wav").exists()
+
+
+def test_full_queue_is_rejected(make_server, tmp_path):
+    server, client = make_server(rtf=0.2, max_queue=1)
+    out = tmp_path / "out"
+    running, result = in_background(lambda: client.speak("Alice", LONG_TEXT, str(out / "a.wav")))
+    time.sleep(0.3)     # Let the worker take it off the queue
+    queued, _ = in_background(lambda: client.speak("Alice", LONG_TEXT, str(out / "b.wav")))
+    time.sleep(0.3)
+    with pytest.raises(ServerError) as error:
+        client.speak("Alice", "One more.", str(out / "c.wav"))
+    assert error.value.status == 503
+    server.queue.queue[0].cancelled = True   # Don't wait for the queued render
+    running.join(15)
+    queued.join(15)
+
+
+def test_timed_out_queued_job_is_skipped(make_server, tmp_path):
+    server, client = make_server(rtf=0.2)
+    out = tmp_path / "out"
+    running, result = in_background(lambda: client.speak("Alice", LONG_TEXT, str(out / "running.wav"), timeout=1))
+    time.sleep(0.3)
+    with pytest.raises(ServerError) as error:
+        client.speak("Alice", LONG_TEXT, str(out / "skipped.wav"), timeout=1)
+    assert error.value.status == 504
+
+    running.join(15)
+    assert isinstance(result[0], ServerError) and result[0].status == 504
+    server.queue.join()     # The worker has drained everything it was given
+    assert (out / "running.wav").exists()        # Already rendering when it timed out
+    assert not (out / "skipped.wav").exists()    # Still queued when it timed out: never rendered
@@ -10,11 +10,16 @@ This script demonstrates various capabilities of Coqui TTS:
 Requirements:
 - Python 3.10+
 - TTS library (pip install TTS)
+
+Models come from the shared registry in src/models.py, so XTTS is loaded once
+for both the cloning and multilingual demos.
 """
 
 import os
 from pathlib import Path
-from TTS.api import TTS
+from src.models import MODELS
+
+XTTS_MODEL = "tts_models/multilingual/multi-dataset/xtts_v2"
 
 # Create output directory
 OUTPUT_DIR = Path("output")
@@ -27,7 +32,7 @@ def demo_basic_tts():
     print("="*60)
     
     # Initialize TTS with a fast English model
-    tts = TTS(model_name="tts_models/en/ljspeech/vits", progress_bar=True)
+    tts = MODELS.get("tts_models/en/ljspeech/vits").tts
     
     # Sample text
     text = "Hello! This is a demonstration of Coqui TTS. The voice you're hearing is generated entirely by AI."
@@ -63,7 +68,7 @@ def demo_voice_cloning():
     
     # Initialize XTTS model (supports voice cloning)
     print("Loading XTTS model (this may take a moment)...")
-    tts = TTS(model_name="tts_models/multilingual/multi-dataset/xtts_v2", progress_bar=True)
+    tts = MODELS.get(XTTS_MODEL).tts
     
     # Sample text for cloning
     text = "This is an example of voice cloning. The model is attempting to replicate the voice from the reference audio."
@@ -90,7 +95,7 @@ def demo_multilingual():
     
     # Initialize XTTS model
     print("Loading multilingual XTTS model...")
-    tts = TTS(model_name="tts_models/multilingual/multi-dataset/xtts_v2", progress_bar=True)
+    tts = MODELS.get(XTTS_MODEL).tts  # Already loaded if demo 2 ran
     
     # Multilingual examples
     examples = [
@@ -132,7 +137,7 @@ def list_available_models():
     
     models = {
         "Voice Cloning": [
-            "tts_models/multilingual/multi-dataset/xtts_v2",
+            XTTS_MODEL,
             "tts_models/multilingual/multi-dataset/your_tts",
         ],
         "Fast English": [
@@ -180,6 +185,9 @@ def main():
         print("DEMO COMPLETE!")
         print("="*60)
         print(f"\n✓ Check the '{OUTPUT_DIR}' folder for generated audio files")
+        print("\nLoaded models:")
+        for model in MODELS.usage():
+            print(f"  • {model['model']}: {model['memory_mb']:.0f} MB")
         print("\nNext Steps:")
         print("  1. Listen to the generated audio files")
         print("  2. Add your own reference_voice.wav for voice cloning")